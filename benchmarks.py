@@ -0,0 +1,482 @@
+"""Micro-benchmarks for the job search pipeline.
+
+Run all benchmarks with ``python benchmarks.py`` or pick some by name,
+e.g. ``python benchmarks.py dedup``.
+"""
+import contextlib
+import glob
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from dedup import NearDuplicateIndex
+from job_search import JobSearcher, posting_date_key
+from matcher import KEYWORD_GROUPS, RelevanceMatcher, TECH_KEYWORDS
+from parse_pool import ParsePool
+from parsing import PARSER, find_cards
+from profiles import DEFAULT_PROFILE, Profile, ProfileSink, searches
+from replay import FixtureArchive, FixtureServer, replay_engine, run_searches
+from results import ResultTable
+from sources import COMPANY_PAGES, SOURCES
+
+# Card selector of each scraped site: (tag, attrs)
+CARD_SELECTORS = {key: spec.card for key, spec in SOURCES.items()}
+
+CARD_TEMPLATES = {
+    'naukri': (
+        '<article class="jobTuple bgWhite br4 mb-8"><div class="jobTupleHeader">'
+        '<a class="title ellipsis" href="/job-listings-react-developer-{i}">React Developer {i}</a>'
+        '<a class="subTitle ellipsis fleft" href="/company-{i}">Company {i}</a></div>'
+        '<ul><li class="experience"><span class="expwdth">2-5 Yrs</span></li>'
+        '<li><span class="ellipsis location">Bangalore/Bengaluru</span></li></ul>'
+        '<div class="job-description fs12 grey-text">React, Redux, TypeScript, 2-5 years</div>'
+        '<span class="job-post-day">{age}</span></article>'
+    ),
+    'indeed': (
+        '<div class="job_seen_beacon"><table><tr><td class="resultContent">'
+        '<h2 class="jobTitle"><a href="/rc/clk?jk={i:016x}" title="Frontend Developer {i}">'
+        '<span>Frontend Developer {i}</span></a></h2>'
+        '<span class="companyName">Company {i}</span>'
+        '<div class="companyLocation">Bengaluru, Karnataka</div>'
+        '</td></tr></table><span class="date">{age}</span></div>'
+    ),
+    'glassdoor': (
+        '<li class="react-job-listing css-7ry9k1" data-id="{i}">'
+        '<a data-test="job-title" href="/job-listing/full-stack-developer-{i}.htm">Full Stack Developer {i}</a>'
+        '<span data-test="employer-name">Company {i}</span>'
+        '<div data-test="job-age">{age}</div></li>'
+    ),
+}
+
+
+# Card age text of each site; "{i}" is the card number
+CARD_AGES = {'naukri': '{i} Days Ago', 'indeed': 'Posted {i} days ago', 'glassdoor': '{i}d'}
+
+
+def sample_page(site, cards=20, filler=200, start=1, age=None):
+    """Synthetic results page shaped like a saved page from a site.
+
+    Cards are numbered from ``start``; ``age`` overrides every card's age text.
+    """
+    noise = ''.join(
+        f'<div class="nav-item"><a href="/browse/{n}">Category {n}</a><span>{"x" * 40}</span></div>'
+        for n in range(filler)
+    )
+    script = '<script>window.__INITIAL_STATE__ = {' + '"k": 1, ' * 2000 + '};</script>'
+    body = ''.join(
+        CARD_TEMPLATES[site].format(i=i, age=age or CARD_AGES[site].format(i=i))
+        for i in range(start, start + cards)
+    )
+    return f'<html><head>{script}</head><body><header>{noise}</header><main>{body}</main><footer>{noise}</footer></body></html>'.encode()
+
+
+def load_sample_pages(directory='samples'):
+    """Saved pages named <site>*.html, falling back to synthetic pages"""
+    pages = {}
+    for site in CARD_SELECTORS:
+        saved = sorted(glob.glob(os.path.join(directory, f'{site}*.html')))
+        if saved:
+            pages[site] = []
+            for path in saved:
+                with open(path, 'rb') as f:
+                    pages[site].append(f.read())
+        else:
+            pages[site] = [sample_page(site)]
+    return pages
+
+
+def bench_dedup(sizes=(1000, 10000, 100000)):
+    """Per-insert cost of add_job_result as the result set grows"""
+    print("📊 add_job_result insert cost")
+    for size in sizes:
+        searcher = JobSearcher()
+        start = time.perf_counter()
+        for i in range(size):
+            searcher.add_job_result(
+                job_title=f"React Developer {i}",
+                company_name=f"Company {i % 997}",
+                location="Bangalore",
+                job_url=f"https://www.naukri.com/job-listings-{i}?src=jobsearchDesk&utm_source=x",
+                posting_date="2024-01-01",
+                source="Naukri.com",
+            )
+        elapsed = time.perf_counter() - start
+
+        # Re-inserting the same postings through aliased URLs must all be rejected
+        duplicates = sum(
+            not searcher.add_job_result(
+                job_title=f"React Developer {i}",
+                company_name=f"Company {i % 997}",
+                location="Bangalore",
+                job_url=f"https://m.naukri.com/job-listings-{i}/#apply",
+                posting_date="2024-01-01",
+                source="Naukri.com",
+            )
+            for i in range(0, size, 10)
+        )
+        print(f"   {size:>8} records: {elapsed / size * 1e6:6.2f} µs/insert, "
+              f"{duplicates} aliased duplicates rejected")
+
+
+def near_duplicate_corpus(size, duplicate_share=0.2):
+    """Distinct openings plus reworded re-listings of some of them.
+
+    Returns ``(postings, opening_ids)`` where equal ids mark the same opening.
+    """
+    roles = ['React Developer', 'Senior Frontend Engineer', 'Java Backend Developer',
+             'Full Stack Engineer (MERN)', 'Data Analyst', 'UI Developer', 'DevOps Engineer',
+             'Node.js Developer', 'QA Automation Engineer', 'Product Designer']
+    teams = ['', ' - Payments', ' - Growth', ', Platform', ' - Search', ' (Contract)', ' II']
+    rewordings = [
+        lambda title: title + ' - Bangalore',
+        lambda title: title + ' (2-5 years)',
+        lambda title: 'Hybrid | ' + title,
+        lambda title: title.replace('Senior', 'Sr.').replace('Frontend', 'Front-end').replace('Node.js', 'NodeJS'),
+    ]
+    titles = [role + team for role in roles for team in teams]
+    openings = int(size * (1 - duplicate_share))
+    postings, ids = [], []
+    for i in range(openings):
+        company = f"Acme{i // len(titles)} Technologies Pvt Ltd"
+        postings.append((titles[i % len(titles)], company, 'Bangalore'))
+        ids.append(i)
+    for n in range(size - openings):
+        i = n * 7919 % openings
+        title, company, _ = postings[i]
+        reword = rewordings[n % len(rewordings)]
+        postings.append((reword(title), company.split()[0], 'Bengaluru, Karnataka'))
+        ids.append(i)
+    return postings, ids
+
+
+def bench_near_dup(sizes=(10000, 100000)):
+    """MinHash/LSH clustering cost and accuracy against exact title+company keys"""
+    print("📊 Near-duplicate clustering")
+    for size in sizes:
+        postings, ids = near_duplicate_corpus(size)
+        index = NearDuplicateIndex()
+        start = time.perf_counter()
+        matches = [index.find_or_add(title, company, location, i)
+                   for (title, company, location), i in zip(postings, ids)]
+        elapsed = time.perf_counter() - start
+        expected = len(postings) - len(set(ids))
+        correct = sum(1 for match, i in zip(matches, ids) if match is not None and match == i)
+        wrong = sum(1 for match, i in zip(matches, ids) if match is not None and match != i)
+        exact = len(postings) - len({(title.lower(), company.lower()) for title, company, _ in postings})
+        print(f"   {size:>8} postings: {elapsed / size * 1e6:6.2f} µs/posting, "
+              f"{correct}/{expected} re-listings merged, {wrong} wrong merges "
+              f"(exact title+company keys: {exact})")
+
+
+def bench_parse(rounds=20):
+    """Results pages parsed per second: full html.parser tree vs card-only parsing"""
+    print(f"📊 Parse throughput (fast backend: {PARSER})")
+    for site, pages in load_sample_pages().items():
+        name, attrs = CARD_SELECTORS[site]
+
+        def full_tree(page):
+            return BeautifulSoup(page, 'html.parser').find_all(name, attrs)
+
+        variants = [
+            ('full tree, html.parser', full_tree),
+            ('cards only, html.parser', lambda page: find_cards(page, name, attrs, 'html.parser')),
+            (f'cards only, {PARSER}', lambda page: find_cards(page, name, attrs)),
+        ]
+        expected = [len(full_tree(page)) for page in pages]
+        for label, parse in variants:
+            assert [len(parse(page)) for page in pages] == expected, label
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for page in pages:
+                    parse(page)
+            elapsed = time.perf_counter() - start
+            print(f"   {site:<10} {label:<26} {rounds * len(pages) / elapsed:8.1f} pages/s")
+
+
+def title_corpus(size):
+    """Deterministic mix of relevant and irrelevant job titles"""
+    roles = ['React Developer', 'Senior Frontend Engineer', 'Java Backend Developer',
+             'Full Stack Engineer (MERN)', 'Data Analyst', 'UI Developer', 'DevOps Engineer',
+             'Node.js Developer', 'QA Automation Engineer', 'Product Designer']
+    suffixes = ['', ' - Bangalore', ' (2-5 years)', ' 8+ yrs', ' | Hybrid', ' - Immediate Joiner']
+    teams = ['', ' - Payments', ' - Growth Team', ', Platform', ' @ Series B Startup', ' (Contract)', ' II']
+    return [
+        roles[i % len(roles)] + teams[i // 7 % len(teams)] + suffixes[i // 3 % len(suffixes)]
+        for i in range(size)
+    ]
+
+
+def bench_matcher(size=1000000):
+    """Per-title cost of keyword loops vs the compiled single-pass matcher"""
+    print(f"📊 Relevance matching over {size:,} titles")
+    titles = title_corpus(size)
+    matcher = RelevanceMatcher()
+    experience_patterns = [re.compile(r'(\d{1,2})\s*(?:-|to)\s*(\d{1,2})\s*(?:years?|yrs?)'),
+                           re.compile(r'(\d{1,2})\s*\+\s*(?:years?|yrs?)')]
+
+    def tech_loop(title):
+        title_lower = title.lower()
+        return any(keyword in title_lower for keyword in TECH_KEYWORDS)
+
+    def all_group_loops(title):
+        title_lower = title.lower()
+        flags = {name: any(keyword in title_lower for keyword in keywords)
+                 for name, keywords in KEYWORD_GROUPS.items()}
+        flags['experience'] = [p.findall(title_lower) for p in experience_patterns]
+        return flags
+
+    variants = [
+        ('tech any() loop only', tech_loop),
+        ('loops, all groups', all_group_loops),
+        ('matcher.scan', matcher.scan),
+        ('matcher.is_relevant', matcher.is_relevant),
+    ]
+    for label, match in variants:
+        start = time.perf_counter()
+        kept = sum(1 for title in titles if match(title))
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<22} {elapsed / size * 1e9:7.0f} ns/title, {kept:,} kept")
+
+
+def careers_page(company, postings):
+    """Synthetic careers page carrying its openings as JSON-LD"""
+    today = date.today().isoformat()
+    graph = [
+        {'@type': 'JobPosting', 'title': f'React Developer {n}', 'datePosted': today,
+         'url': f"{company['url'].rstrip('/')}/jobs/react-developer-{n}",
+         'hiringOrganization': {'@type': 'Organization', 'name': company['name']},
+         'jobLocation': {'@type': 'Place', 'address': {'addressLocality': 'Bengaluru'}}}
+        for n in range(postings)
+    ]
+    script = json.dumps({'@context': 'https://schema.org', '@graph': graph})
+    return f'<html><head><script type="application/ld+json">{script}</script></head><body></body></html>'.encode()
+
+
+def synthetic_fixtures(path, scale=1, cards=20):
+    """Fixture archive of fresh results pages for every source query plus careers pages.
+
+    Each query gets ``3 * scale`` pages; sitemaps answer 404 so company
+    crawls fall back to their careers page.
+    """
+    archive = FixtureArchive(path, 'w')
+    headers = {'Content-Type': 'text/html; charset=utf-8'}
+    start = 1
+    for key, spec in SOURCES.items():
+        for query, city in searches(spec, [DEFAULT_PROFILE]):
+            for page in range(1, 3 * scale + 1):
+                body = sample_page(key, cards, start=start, age='Just posted')
+                archive.add(spec.page_url(query, page, city), 200, headers, body)
+                start += cards
+    for company in COMPANY_PAGES:
+        archive.add(urljoin(company['url'], '/sitemap.xml'), 404, {}, b'')
+        archive.add(company['url'], 200, headers, careers_page(company, 10 * scale))
+    archive.close()
+    return path
+
+
+def peak_rss_mib():
+    """Peak resident memory of this process so far, or None where unsupported"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def bench_end_to_end(scales=(1, 10, 100)):
+    """Whole searches replayed from a local fixture server at growing page counts.
+
+    Peak memory is the process high-water mark, so it only grows between scales.
+    """
+    print("📊 End-to-end replay throughput")
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            archive = FixtureArchive(synthetic_fixtures(os.path.join(directory, 'fixtures.zip'), scale))
+            with FixtureServer(archive) as server:
+                searcher = JobSearcher(engine=replay_engine(server), cache_dir=None,
+                                       max_pages=3 * scale, crawl_state=None)
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run_searches(searcher)
+                elapsed = time.perf_counter() - start
+                searcher.engine.sessions.close()
+            archive.close()
+        parse = sum(stats.seconds['parse'] for stats in searcher.metrics.stats.values())
+        peak = peak_rss_mib()
+        print(f"   {scale:>4}x {server.served:>6} pages in {elapsed:6.2f}s "
+              f"({server.served / elapsed:6.1f} pages/s, parse {parse:5.2f}s), "
+              f"{len(searcher.results):>6} results"
+              + (f", peak RSS {peak:6.1f} MiB" if peak is not None else "")
+              + (f", {len(server.misses)} misses" if server.misses else ""))
+
+
+def result_records(size):
+    """Records shaped like add_job_result's, with every string a fresh object as parsed cards give"""
+    sources = ['Naukri.com', 'Indeed.com', 'Glassdoor', 'Flipkart Careers']
+    locations = ['Bangalore/Bengaluru', 'Bengaluru, Karnataka', 'Bangalore', 'Remote']
+    for i in range(size):
+        url = f"https://www.naukri.com/job-listings-react-developer-{i}"
+        yield {
+            'Job Title': f"React Developer {i}",
+            'Company Name': f"Company {i % 997} Technologies",
+            'Location': (' ' + locations[i % len(locations)])[1:],
+            'Job URL': url,
+            'Posting Date': f"2026-10-{i % 28 + 1:02d}",
+            'Source': sources[i % len(sources)],
+            'Source URLs': url,
+        }
+
+
+def bench_results(size=1000000):
+    """Per-record memory and whole-set filter/sort/group cost: list of dicts vs ResultTable"""
+    print(f"📊 Result container over {size:,} postings")
+    today = '2026-10-18'
+
+    def build_dicts():
+        return list(result_records(size))
+
+    def build_table():
+        table = ResultTable()
+        for record in result_records(size):
+            table.append(record)
+        return table
+
+    def dict_ops(jobs):
+        kept = [job for job in jobs if job['Posting Date'] == today]
+        ordered = sorted(jobs, key=posting_date_key, reverse=True)
+        groups = {}
+        for job in jobs:
+            groups.setdefault(job['Source'], []).append(job)
+        return len(kept), len(ordered), len(groups)
+
+    def table_ops(table):
+        kept = table.mask('Posting Date', today.__eq__)
+        ordered = table.argsort('Posting Date', reverse=True)
+        groups = table.group('Source')
+        return len(kept), len(ordered), len(groups)
+
+    for label, build, ops in (('list of dicts', build_dicts, dict_ops), ('ResultTable', build_table, table_ops)):
+        tracemalloc.start()
+        results = build()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        counts = ops(results)
+        elapsed = time.perf_counter() - start
+        print(f"   {label:<14} {memory / size:6.0f} B/record, "
+              f"filter+sort+group {elapsed:5.2f}s (kept, sorted, groups: {counts})")
+        del results
+
+
+class CountingSink:
+    path = ''
+
+    def __init__(self):
+        self.count = 0
+
+    def write(self, record):
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+def team_profiles(count):
+    """Profiles of a team whose roles and cities overlap"""
+    roles = ['React Developer', 'Frontend Developer', 'Full Stack Developer', 'Java Developer',
+             'Node.js Developer', 'Data Analyst', 'DevOps Engineer']
+    cities = ['Bangalore', 'Bengaluru', 'Pune', 'Hyderabad']
+    return [
+        Profile(f"member{n}", roles=[roles[n % len(roles)], roles[(n * 3 + 1) % len(roles)]],
+                cities=[cities[n % len(cities)]], experience=(n % 4 + 1, n % 4 + 5))
+        for n in range(count)
+    ]
+
+
+def bench_profiles(counts=(1, 3, 10, 30), records=20000):
+    """Search URLs per crawl and result fan-out cost as profiles are added"""
+    print("📊 Multi-profile crawl")
+    titles = title_corpus(records)
+    locations = ['Bangalore', 'Bengaluru, Karnataka', 'Pune', 'Hyderabad', 'Remote']
+    postings = [{'Job Title': title, 'Location': locations[i % len(locations)]} for i, title in enumerate(titles)]
+    for count in counts:
+        profiles = team_profiles(count)
+        separate = sum(len(searches(spec, [profile])) for spec in SOURCES.values() for profile in profiles)
+        shared = sum(len(searches(spec, profiles)) for spec in SOURCES.values())
+        sink = ProfileSink((profile, CountingSink()) for profile in profiles)
+        start = time.perf_counter()
+        for posting in postings:
+            sink.write(posting)
+        elapsed = time.perf_counter() - start
+        routed = sum(route.count for route in sink.sinks)
+        print(f"   {count:>3} profiles: {shared:>3} searches (vs {separate:>3} crawling per profile), "
+              f"fan-out {elapsed / records * 1e6:6.1f} µs/result, {routed / records:4.2f} exports/result")
+
+
+def bench_parse_pool(scale=10, workers=None):
+    """Results-page crawl replayed from recorded pages, parsing in-process vs in worker processes.
+
+    Only the results-page sources run, so every page goes through the parse
+    stage; ``stalls`` counts dispatch rounds held back by a full pool.
+    """
+    cores = os.cpu_count() or 1
+    workers = workers or sorted({1, 2, cores} | {2**n for n in range(cores.bit_length()) if 2**n <= cores})
+    print(f"📊 Parse pool over recorded results pages ({cores} cores)")
+    with tempfile.TemporaryDirectory() as directory:
+        archive = FixtureArchive(synthetic_fixtures(os.path.join(directory, 'fixtures.zip'), scale))
+        with FixtureServer(archive) as server:
+            for count in [0] + list(workers):
+                pool = ParsePool(count) if count else None
+                if pool:
+                    pool.warm_up()
+                searcher = JobSearcher(engine=replay_engine(server), cache_dir=None, max_pages=3 * scale,
+                                       crawl_state=None, parse_pool=pool)
+                served = server.served
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    for key in SOURCES:
+                        searcher.search_source(key)
+                elapsed = time.perf_counter() - start
+                pages = server.served - served
+                searcher.engine.sessions.close()
+                label = f"{count} worker{'s' if count > 1 else ''}" if count else 'in-process'
+                print(f"   {label:>11}: {pages} pages in {elapsed:6.2f}s ({pages / elapsed:6.1f} pages/s), "
+                      f"{len(searcher.results)} results"
+                      + (f", {searcher.engine.stalls} stalls at {pool.max_pending} pending" if pool else ""))
+                if pool:
+                    pool.close()
+        archive.close()
+
+
+BENCHMARKS = {
+    'dedup': bench_dedup,
+    'near_dup': bench_near_dup,
+    'parse': bench_parse,
+    'matcher': bench_matcher,
+    'end_to_end': bench_end_to_end,
+    'results': bench_results,
+    'profiles': bench_profiles,
+    'parse_pool': bench_parse_pool,
+}
+
+
+def main(names):
+    for name in names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,227 @@
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urlsplit
+
+from fetch_engine import FetchTask
+from parsing import find_cards, json_ld_location, json_ld_postings, make_soup, parse_iso_date
+
+GREENHOUSE_FEED = 'https://boards-api.greenhouse.io/v1/boards/{token}/jobs'
+LEVER_FEED = 'https://api.lever.co/v0/postings/{slug}?mode=json'
+
+# ATS job boards linked or embedded from a careers page, e.g.
+#   boards.greenhouse.io/razorpay
+#   boards.greenhouse.io/embed/job_board?for=razorpay
+#   boards.greenhouse.io/embed/job_board/js?for=razorpay   (the standard embed script)
+#   boards-api.greenhouse.io/v1/boards/razorpay/jobs
+#   jobs.lever.co/swiggy
+GREENHOUSE_LINK = re.compile(
+    rb'boards(?:-api)?\.greenhouse\.io/(?:embed/job_board(?:/js)?\?for=|v1/boards/)?([A-Za-z0-9_-]+)'
+)
+LEVER_LINK = re.compile(rb'jobs\.lever\.co/([A-Za-z0-9_-]+)')
+
+# Sitemap entries that look like individual openings
+JOB_URL = re.compile(r'/(?:jobs?|careers?|positions?|openings?|vacanc(?:y|ies)|roles?)/[^/?#]+', re.I)
+
+
+class CompanyCrawler:
+    """Finds openings on company career sites, cheapest source first.
+
+    For each company the crawler tries, in order:
+
+    1. a configured Greenhouse / Lever board (one JSON request for all openings),
+    2. the sitemap, fetching only job pages whose ``lastmod`` changed since
+       the previous crawl and reading their JSON-LD ``JobPosting`` blocks,
+    3. the careers page itself: JSON-LD postings, links to an ATS board
+       (followed as in 1.) and, as a last resort, job-looking anchors.
+
+    Every posting found is passed to ``on_posting(company, posting)`` as a
+    dict with ``title``, ``company``, ``location``, ``url`` and ``posted``
+    (a date or None).
+    """
+
+    def __init__(self, on_posting, state_path='.company_crawl_state.json',
+                 max_pages_per_company=100, on_error=None):
+        self.on_posting = on_posting
+        self.on_error = on_error
+        self.state_path = state_path
+        self.max_pages_per_company = max_pages_per_company
+        self.lastmod = {}
+        if state_path and os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as f:
+                self.lastmod = json.load(f)
+        self._budget = {}
+        self._pending_lastmod = {}
+
+    def save_state(self):
+        """Remember sitemap lastmod values for the next incremental crawl"""
+        if self.state_path:
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(self.lastmod, f, indent=1, sort_keys=True)
+
+    def tasks(self, companies):
+        for company in companies:
+            self._budget[company['name']] = self.max_pages_per_company
+            if company.get('greenhouse') or company.get('lever'):
+                yield from self._feed_tasks(company, company.get('greenhouse'), company.get('lever'))
+            else:
+                yield self._task(company, self._sitemap_url(company), self.handle_sitemap)
+
+    def _task(self, company, url, handler):
+        return FetchTask(
+            url,
+            lambda response: handler(company, response),
+            on_error=lambda error: self._error(company, error),
+            source=f"{company['name']} Careers",
+        )
+
+    def _error(self, company, error):
+        if self.on_error:
+            self.on_error(company, error)
+
+    def _sitemap_url(self, company):
+        if company.get('sitemap'):
+            return company['sitemap']
+        parts = urlsplit(company['url'])
+        return f'{parts.scheme}://{parts.netloc}/sitemap.xml'
+
+    def _feed_tasks(self, company, greenhouse=None, lever=None):
+        if greenhouse:
+            yield self._task(company, GREENHOUSE_FEED.format(token=greenhouse), self.handle_greenhouse)
+        if lever:
+            yield self._task(company, LEVER_FEED.format(slug=lever), self.handle_lever)
+
+    def _emit(self, company, title, url, location=None, posted=None, company_name=None):
+        if title and url:
+            self.on_posting(company, {
+                'title': title.strip(),
+                'company': company_name or company['name'],
+                'location': (location or '').strip(),
+                'url': url,
+                'posted': posted,
+            })
+
+    # ATS feeds
+
+    def handle_greenhouse(self, company, response):
+        if response.status_code != 200:
+            return None
+        for job in response.json().get('jobs', []):
+            self._emit(
+                company,
+                job.get('title'),
+                job.get('absolute_url'),
+                (job.get('location') or {}).get('name'),
+                parse_iso_date(job.get('updated_at')),
+            )
+        return None
+
+    def handle_lever(self, company, response):
+        if response.status_code != 200:
+            return None
+        for job in response.json():
+            created = job.get('createdAt')
+            self._emit(
+                company,
+                job.get('text'),
+                job.get('hostedUrl'),
+                (job.get('categories') or {}).get('location'),
+                datetime.fromtimestamp(created / 1000, timezone.utc).date() if created else None,
+            )
+        return None
+
+    # Sitemaps
+
+    def handle_sitemap(self, company, response):
+        if response.status_code != 200:
+            return [self._task(company, company['url'], self.handle_careers_page)]
+        try:
+            root = ET.fromstring(response.content)
+        except ET.ParseError:
+            return [self._task(company, company['url'], self.handle_careers_page)]
+
+        follow_up = []
+        if root.tag.endswith('sitemapindex'):
+            # Only descend into child sitemaps that look job related
+            for loc in root.iterfind('{*}sitemap/{*}loc'):
+                url = (loc.text or '').strip()
+                if re.search(r'job|career|position|opening', url, re.I):
+                    follow_up.append(self._task(company, url, self.handle_sitemap))
+            return follow_up or [self._task(company, company['url'], self.handle_careers_page)]
+
+        job_urls = 0
+        for entry in root.iterfind('{*}url'):
+            url = (entry.findtext('{*}loc') or '').strip()
+            if not JOB_URL.search(urlsplit(url).path):
+                continue
+            job_urls += 1
+            lastmod = (entry.findtext('{*}lastmod') or '').strip()
+            if lastmod and self.lastmod.get(url) == lastmod:
+                continue  # unchanged since the last crawl
+            if self._budget[company['name']] <= 0:
+                break
+            self._budget[company['name']] -= 1
+            self._pending_lastmod[url] = lastmod
+            follow_up.append(self._task(
+                company, url, lambda company, response, url=url: self.handle_job_page(company, response, url)
+            ))
+        if not job_urls:
+            return [self._task(company, company['url'], self.handle_careers_page)]
+        return follow_up
+
+    # HTML pages
+
+    def handle_job_page(self, company, response, sitemap_url=None):
+        if response.status_code != 200:
+            return None
+        # Only a successfully read page counts as crawled for this lastmod
+        if sitemap_url in self._pending_lastmod:
+            self.lastmod[sitemap_url] = self._pending_lastmod.pop(sitemap_url)
+        postings = json_ld_postings(response.content)
+        if postings:
+            for posting in postings:
+                self._emit_json_ld(company, posting, response.url)
+            return None
+        # No structured data: fall back to the page heading
+        soup = make_soup(response.content)
+        heading = soup.find('h1') or soup.find('title')
+        if heading:
+            self._emit(company, heading.get_text(strip=True), response.url)
+        return None
+
+    def handle_careers_page(self, company, response):
+        if response.status_code != 200:
+            return None
+        postings = json_ld_postings(response.content)
+        for posting in postings:
+            self._emit_json_ld(company, posting, response.url)
+        if postings:
+            return None
+
+        greenhouse = GREENHOUSE_LINK.search(response.content)
+        lever = LEVER_LINK.search(response.content)
+        if greenhouse or lever:
+            return list(self._feed_tasks(
+                company,
+                greenhouse.group(1).decode() if greenhouse else None,
+                lever.group(1).decode() if lever else None,
+            ))
+
+        for anchor in find_cards(response.content, 'a', {'href': True}):
+            href = urljoin(response.url or company['url'], anchor['href'])
+            if JOB_URL.search(urlsplit(href).path):
+                self._emit(company, anchor.get_text(' ', strip=True), href)
+        return None
+
+    def _emit_json_ld(self, company, posting, page_url):
+        organization = posting.get('hiringOrganization')
+        self._emit(
+            company,
+            posting.get('title'),
+            posting.get('url') or page_url,
+            json_ld_location(posting.get('jobLocation')),
+            parse_iso_date(posting.get('datePosted')),
+            organization.get('name') if isinstance(organization, dict) else None,
+        )
@@ -0,0 +1,170 @@
+"""Long-running search that polls each source on its own schedule.
+
+``python daemon.py`` keeps one ``JobSearcher`` alive between polls, so
+pooled connections, the HTTP cache, the dedup indexes and the job store
+stay warm.  Every source (and the company career pages) is polled on its
+own interval: a poll that finds new postings shortens it, an empty poll
+lengthens it.  Only postings not seen before are pushed to the
+notification targets given with ``--notify``: a file, an http(s):// webhook,
+tcp://host:port or unix:///path.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from functools import partial
+
+from enrichment import DetailCache, DetailEnricher
+from exporters import open_match_sink
+from instrumentation import RunMetrics
+from job_search import JobSearcher
+from job_store import JobStore
+from profiles import PROFILE_FILE, load_profiles
+from sources import SOURCES
+
+# Poll intervals in seconds
+DEFAULT_INTERVAL = 15 * 60
+MIN_INTERVAL = 5 * 60
+MAX_INTERVAL = 2 * 60 * 60
+
+
+class PollSchedule:
+    """Polling interval of one source, following how often it has new postings.
+
+    A poll with new postings halves the interval down to ``min_interval``;
+    an empty poll stretches it by ``backoff`` up to ``max_interval``.
+    ``after`` (optional) is called once the poll's fetches are done.
+    """
+
+    def __init__(self, name, tasks, interval=DEFAULT_INTERVAL, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL, backoff=1.5, after=None):
+        self.name = name
+        self.tasks = tasks
+        self.after = after
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = max(min_interval, min(max_interval, interval))
+        self.backoff = backoff
+        self.due = 0.0
+        self.polls = 0
+        self.found = 0
+
+    def record(self, new, now):
+        """Update the interval after a poll that found ``new`` postings"""
+        if new:
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+        self.polls += 1
+        self.found += new
+        self.due = now + self.interval
+
+
+class SearchDaemon:
+    """Runs due polls one at a time against a warm JobSearcher"""
+
+    def __init__(self, searcher, sinks, schedules=None, clock=time.monotonic, sleep=time.sleep):
+        self.searcher = searcher
+        self.sinks = sinks
+        self.schedules = schedules or default_schedules(searcher)
+        self.clock = clock
+        self.sleep = sleep
+
+    def poll(self, schedule):
+        """Fetch one source and push its new postings; returns them"""
+        searcher = self.searcher
+        # Fresh metrics per poll, so a long run does not keep every request timing
+        searcher.metrics = searcher.engine.metrics = RunMetrics()
+        if searcher.store:
+            searcher.store.start_run()
+        start = len(searcher.results)
+        searcher.engine.run(schedule.tasks())
+        if schedule.after:
+            schedule.after()
+        found = searcher.results[start:]
+        searcher.enrich_results(found)
+
+        # Detail pages may reveal an older posting date than the card showed
+        cutoff = searcher.posting_cutoff()
+        new = [job for job in found if job['Posting Date'] >= cutoff]
+        if searcher.store:
+            new = searcher.store.upsert(new)[0]
+            searcher.store.touch(searcher.seen_known)
+            searcher.store.finish_run(len(new), len(new) + len(searcher.seen_known))
+            searcher.seen_known.clear()
+        for job in new:
+            for sink in self.sinks:
+                sink.write(job)
+
+        # Pushed postings live on in the dedup indexes only
+        searcher.results.clear()
+        searcher.record_updates.clear()
+        searcher.dropped_urls.clear()
+        searcher.metrics.finish()
+        schedule.record(len(new), self.clock())
+        print(f"⏰ {datetime.now().strftime('%H:%M:%S')} {schedule.name}: {len(new)} new, "
+              f"{searcher.metrics.wall_seconds:.1f}s, next poll in {schedule.interval / 60:.0f} min")
+        return new
+
+    def run(self, max_polls=None):
+        """Poll due sources until interrupted (or ``max_polls`` polls have run)"""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            schedule = min(self.schedules, key=lambda schedule: schedule.due)
+            wait = schedule.due - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+            try:
+                self.poll(schedule)
+            except Exception as e:
+                print(f"❌ Error polling {schedule.name}: {e}")
+                schedule.record(0, self.clock())
+            polls += 1
+
+
+def default_schedules(searcher, interval=DEFAULT_INTERVAL):
+    """One schedule per registered source plus one for company career pages"""
+    schedules = [
+        PollSchedule(spec.name, partial(searcher.source_tasks, spec), interval, min(MIN_INTERVAL, interval))
+        for spec in SOURCES.values()
+    ]
+    schedules.append(PollSchedule('Company pages', searcher.company_page_tasks, interval,
+                                  min(MIN_INTERVAL, interval), after=searcher.company_crawler.save_state))
+    return schedules
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Poll job sources and push new matches as they appear")
+    parser.add_argument('--notify', action='append', metavar='TARGET',
+                        help="file, http(s):// webhook, tcp://host:port or unix:///path (repeatable)")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL / 60,
+                        help="starting poll interval in minutes (default: %(default)g)")
+    args = parser.parse_args(argv)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    targets = args.notify or [f"new_jobs_{timestamp}.jsonl"]
+    profiles = load_profiles(PROFILE_FILE) if os.path.exists(PROFILE_FILE) else None
+    searcher = JobSearcher(store=JobStore(), enricher=DetailEnricher(DetailCache()), profiles=profiles)
+    sinks = [open_match_sink(target) for target in targets]
+    daemon = SearchDaemon(searcher, sinks, default_schedules(searcher, args.interval * 60))
+    print(f"🛰️  Polling {len(daemon.schedules)} sources; new matches go to {', '.join(targets)}")
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping")
+    finally:
+        for sink in sinks:
+            sink.close()
+        print(f"📬 Pushed {sum(schedule.found for schedule in daemon.schedules)} new matches")
+        if searcher.engine.cache:
+            searcher.engine.cache.print_stats()
+        searcher.enricher.cache.print_stats()
+        searcher.enricher.cache.close()
+        searcher.engine.sessions.close()
+        searcher.store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
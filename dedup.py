@@ -0,0 +1,263 @@
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'msclkid', 'ref', 'refid', 'ref_', 'src', 'source',
+    'from', 'trk', 'trkinfo', 'trackingid', 'tk', 'vjk_src', 'sid', 'jobsearchid',
+    'searchid', 'xid', 'guid', 'srcid', 'cmp', 'campaign',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+# Hosts that serve the same postings under different names
+HOST_ALIASES = {
+    'naukri.com': 'naukri.com',
+    'm.naukri.com': 'naukri.com',
+    'in.indeed.com': 'indeed.com',
+    'indeed.com': 'indeed.com',
+    'm.indeed.com': 'indeed.com',
+    'indeed.co.in': 'indeed.com',
+    'glassdoor.co.in': 'glassdoor.com',
+    'glassdoor.com': 'glassdoor.com',
+    'in.linkedin.com': 'linkedin.com',
+    'linkedin.com': 'linkedin.com',
+}
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_host(host):
+    """Lowercase a host and fold www./mobile prefixes and known aliases"""
+    host = host.lower().split(':')[0]
+    if host.startswith('www.'):
+        host = host[4:]
+    return HOST_ALIASES.get(host, host)
+
+
+def normalize_url(url):
+    """Canonical form of a job URL used as the primary dedup key"""
+    parts = urlsplit(url.strip())
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(('https', normalize_host(parts.netloc), path, urlencode(query), ''))
+
+
+def normalize_text(text):
+    """Lowercase text and collapse punctuation and whitespace"""
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def title_company_key(job_title, company_name):
+    """Secondary dedup key matching the same posting behind different URLs"""
+    return normalize_text(job_title) + '|' + normalize_text(company_name)
+
+
+# Words that vary between listings of the same employer
+COMPANY_SUFFIXES = {
+    'the', 'pvt', 'private', 'ltd', 'limited', 'llp', 'inc', 'incorporated', 'corp',
+    'corporation', 'co', 'company', 'india', 'technologies', 'technology', 'tech',
+    'solutions', 'software', 'services', 'labs', 'group', 'global', 'systems',
+}
+
+CITY_ALIASES = {
+    'bengaluru': 'bangalore',
+    'blr': 'bangalore',
+    'gurugram': 'gurgaon',
+    'bombay': 'mumbai',
+    'madras': 'chennai',
+    'new delhi': 'delhi',
+}
+
+# Experience ranges, work modes and hiring calls appended to titles
+TITLE_NOISE = re.compile(
+    r'\d+\s*(?:-|to|\+)?\s*(?:\d+\s*)?(?:years?|yrs?)'
+    r'|\b(?:hybrid|remote|onsite|on-site|wfh|work from (?:home|office)|immediate joiners?'
+    r'|urgent(?:ly)?|hiring|opening|vacancy)\b'
+)
+# "React.js", "ReactJS" and "React JS" all mean React
+JS_SUFFIX = re.compile(r'(?<=[a-z])[.\s]?js\b')
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior', 'jr': 'junior', 'engg': 'engineer', 'eng': 'engineer',
+    'dev': 'developer', 'mgr': 'manager', 'fe': 'frontend', 'be': 'backend',
+}
+LEVEL_WORDS = {
+    'intern', 'trainee', 'junior', 'associate', 'senior', 'lead', 'staff', 'principal', 'head',
+    'i', 'ii', 'iii', 'iv', '1', '2', '3', '4',
+}
+_CITY_WORDS = set(CITY_ALIASES) | set(CITY_ALIASES.values()) | {'hyderabad', 'pune', 'noida'}
+_HASH_MASK = (1 << 64) - 1
+
+
+def normalize_company(company_name):
+    """Company name without legal suffixes and filler words"""
+    words = normalize_text(company_name).split()
+    core = [word for word in words if word not in COMPANY_SUFFIXES]
+    return ' '.join(core or words)
+
+
+def normalize_location(location):
+    """First city of a location string, with common aliases folded"""
+    city = normalize_text(re.split(r'[,/(]', location or '', 1)[0])
+    return CITY_ALIASES.get(city, city)
+
+
+def normalize_title(job_title):
+    """Title without the city, experience and work-mode noise sites add to it"""
+    text = normalize_text(TITLE_NOISE.sub(' ', JS_SUFFIX.sub('', job_title.lower())))
+    return ' '.join(
+        TITLE_ABBREVIATIONS.get(word, word) for word in text.split() if word not in _CITY_WORDS
+    )
+
+
+def _grams(text, k=3):
+    padded = f' {text} '
+    return {hash(padded[i:i + k]) & _HASH_MASK for i in range(max(1, len(padded) - k + 1))}
+
+
+def title_markers(title):
+    """Level words and numbers of a normalized title, which must agree exactly"""
+    return tuple(sorted({word for word in title.split() if word in LEVEL_WORDS or not word.isalpha()}))
+
+
+def title_shingles(title):
+    # Spaces are dropped so "front end" / "frontend" and "react js" / "reactjs" agree
+    return _grams(title.replace(' ', ''))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def overlap(a, b):
+    """Share of the smaller set found in the larger one"""
+    return len(a & b) / min(len(a), len(b)) if a and b else float(a == b)
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index that finds the same opening listed with different wording.
+
+    Postings are blocked on their city, the first word of the normalized
+    company name and the level words and numbers in the title.  Within a
+    block, titles are compared by one-permutation MinHash: each title
+    shingle hash is routed to one of ``num_hashes`` bins that keeps its
+    minimum, empty bins borrowing from a neighbour, and the signature is
+    cut into bands of ``rows`` values.  Postings sharing a band are
+    candidates; a candidate matches when the exact Jaccard similarity of
+    the titles reaches ``threshold`` and at least ``company_threshold`` of
+    the shorter company name's shingles appear in the other.  Inserting and
+    looking up are O(bands), so building the index is linear in the number
+    of postings.
+
+    Signatures rely on ``hash()`` and are only valid within one process.
+    """
+
+    def __init__(self, threshold=0.8, company_threshold=0.8, num_hashes=24, rows=3):
+        if num_hashes % rows:
+            raise ValueError("num_hashes must be a multiple of rows")
+        self.threshold = threshold
+        self.company_threshold = company_threshold
+        self.num_hashes = num_hashes
+        self.rows = rows
+        # Per entry: (normalized title, normalized company), signature fingerprint and payload
+        self.texts = []
+        self.fingerprints = []
+        self.payloads = []
+        self.buckets = {}
+
+    def __len__(self):
+        return len(self.payloads)
+
+    def signature(self, shingle_hashes):
+        bins = self.num_hashes
+        empty = _HASH_MASK
+        minima = [empty] * bins
+        for value in shingle_hashes:
+            slot = value % bins
+            value //= bins
+            if value < minima[slot]:
+                minima[slot] = value
+        if empty in minima:
+            # Densify: an empty bin borrows the next filled bin to its right
+            filled = minima[:]
+            last = None
+            for j in range(2 * bins - 1, -1, -1):
+                value = minima[j % bins]
+                if value != empty:
+                    last = (value, j)
+                elif j < bins and last is not None:
+                    filled[j] = last[0] + (last[1] - j)
+            minima = filled
+        return minima
+
+    def _prepare(self, job_title, company_name, location):
+        title = normalize_title(job_title)
+        company = normalize_company(company_name)
+        grams = title_shingles(title)
+        signature = self.signature(grams)
+        block = (company.partition(' ')[0], normalize_location(location), title_markers(title))
+        rows = self.rows
+        keys = [
+            hash(block + (band,) + tuple(signature[band * rows:(band + 1) * rows]))
+            for band in range(self.num_hashes // rows)
+        ]
+        # Low byte of every bin: enough to estimate agreement, 24 bytes per entry
+        fingerprint = bytes(value & 0xFF for value in signature)
+        return (title, company), grams, fingerprint, keys
+
+    def _lookup(self, text, grams, fingerprint, keys):
+        title, company = text
+        # Signatures agreeing on far fewer bins than the threshold are not worth verifying
+        min_agreement = (self.threshold - 0.3) * self.num_hashes
+        checked = set()
+        for key in keys:
+            entries = self.buckets.get(key)
+            if entries is None:
+                continue
+            for entry in (entries,) if isinstance(entries, int) else entries:
+                if entry in checked:
+                    continue
+                checked.add(entry)
+                if sum(map(int.__eq__, fingerprint, self.fingerprints[entry])) < min_agreement:
+                    continue
+                other_title, other_company = self.texts[entry]
+                if (title_markers(title) == title_markers(other_title)
+                        and jaccard(grams, title_shingles(other_title)) >= self.threshold
+                        and overlap(_grams(company), _grams(other_company)) >= self.company_threshold):
+                    return self.payloads[entry]
+        return None
+
+    def _insert(self, text, fingerprint, keys, payload):
+        entry = len(self.payloads)
+        self.texts.append(text)
+        self.fingerprints.append(fingerprint)
+        self.payloads.append(payload)
+        for key in keys:
+            # Most buckets hold one posting: store a bare id until a second arrives
+            entries = self.buckets.get(key)
+            if entries is None:
+                self.buckets[key] = entry
+            elif isinstance(entries, int):
+                self.buckets[key] = [entries, entry]
+            else:
+                entries.append(entry)
+
+    def find(self, job_title, company_name, location):
+        """Payload of an indexed near-duplicate of a posting, or None"""
+        return self._lookup(*self._prepare(job_title, company_name, location))
+
+    def add(self, job_title, company_name, location, payload):
+        """Index a posting without looking for duplicates first"""
+        text, _, fingerprint, keys = self._prepare(job_title, company_name, location)
+        self._insert(text, fingerprint, keys, payload)
+
+    def find_or_add(self, job_title, company_name, location, payload):
+        """Payload of an indexed near-duplicate, or None after indexing this posting"""
+        text, grams, fingerprint, keys = self._prepare(job_title, company_name, location)
+        match = self._lookup(text, grams, fingerprint, keys)
+        if match is None:
+            self._insert(text, fingerprint, keys, payload)
+        return match
@@ -0,0 +1,258 @@
+"""Detail-page enrichment.
+
+Results pages only carry title, company, location and URL.  The
+``DetailEnricher`` fetches each result's own page and reads the real
+posting date, experience range, salary and skill tags from it, preferring
+the page's schema.org ``JobPosting`` data over text patterns.
+
+Parsed details are kept in a ``DetailCache`` keyed by URL.  A listing whose
+title/company/location are unchanged since it was enriched is not fetched
+again, and a fetched page whose body hashes the same as last time is not
+parsed again.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+from datetime import datetime
+
+from dedup import normalize_url
+from fetch_engine import FetchTask
+from matcher import experience_ranges, trie_pattern
+from parsing import json_ld_postings, make_soup, parse_iso_date, parse_posted_date
+
+# Skill tags recognised in page text: lowercase spelling -> display name
+SKILLS = {
+    'react': 'React', 'reactjs': 'React', 'react.js': 'React', 'redux': 'Redux',
+    'next.js': 'Next.js', 'nextjs': 'Next.js', 'javascript': 'JavaScript', 'typescript': 'TypeScript',
+    'node.js': 'Node.js', 'nodejs': 'Node.js', 'express': 'Express', 'angular': 'Angular',
+    'vue': 'Vue', 'vue.js': 'Vue', 'html': 'HTML', 'css': 'CSS', 'sass': 'Sass',
+    'tailwind': 'Tailwind', 'webpack': 'Webpack', 'graphql': 'GraphQL', 'rest api': 'REST',
+    'jest': 'Jest', 'cypress': 'Cypress', 'mongodb': 'MongoDB', 'postgresql': 'PostgreSQL',
+    'mysql': 'MySQL', 'python': 'Python', 'django': 'Django', 'java': 'Java',
+    'spring boot': 'Spring Boot', 'aws': 'AWS', 'docker': 'Docker', 'kubernetes': 'Kubernetes',
+    'git': 'Git', 'figma': 'Figma', 'react native': 'React Native',
+}
+SKILL_PATTERN = re.compile(r'(?<![\w.])(' + trie_pattern(SKILLS) + r')(?![\w])')
+
+# "₹ 8-15 LPA", "INR 12,00,000 - 18,00,000 per annum", "10 - 18 Lacs P.A."
+SALARY_PATTERN = re.compile(
+    r'(?:(?:₹|rs\.?|inr)\s*)?\d[\d,.]*\s*(?:-|–|to)\s*\d[\d,.]*\s*'
+    r'(?:lpa|lakhs?|lacs?|l\b|k\b|cr\b|per annum|p\.?a\.?|/\s*(?:yr|year|month|mo))(?:\s*p\.?a\.?)?'
+    r'|(?:₹|rs\.?|inr)\s*\d[\d,.]*(?:\s*(?:-|–|to)\s*\d[\d,.]*)?(?:\s*(?:lpa|lakhs?|lacs?|per annum|p\.?a\.?))?',
+    re.I,
+)
+# An age right after "posted" ("Posted: 3 days ago", "Posted on 2024-05-02", "Posted today")
+# or followed by "ago" ("Updated 2 days ago"), not any "30 days" on the page
+_AGE = r'(?:\d+\+?\s*(?:minute|min|hour|hr|day|week|month|mo|[mhdw])s?|(?:a\s+)?few\s+(?:minute|hour)s?)\b'
+POSTED_PATTERN = re.compile(
+    r'\bposted\s*(?:on\b|:)?\s*(\d{4}-\d{2}-\d{2}|just\s+now|today|yesterday|' + _AGE + r')'
+    r'|(' + _AGE + r'\s+ago)\b',
+    re.I,
+)
+
+DETAIL_FIELDS = ('posted', 'experience', 'salary', 'skills')
+
+DETAIL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS details (
+    url_key      TEXT PRIMARY KEY,
+    listing_hash TEXT NOT NULL,
+    body_hash    TEXT,
+    details      TEXT NOT NULL,
+    fetched_at   TEXT NOT NULL
+);
+"""
+
+
+def listing_hash(record):
+    """Hash of the results-page fields; a change means the posting may have changed"""
+    text = '\x1f'.join(str(record.get(key, '')) for key in ('Job Title', 'Company Name', 'Location', 'Job URL'))
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class DetailCache:
+    """SQLite cache of parsed detail pages keyed by normalized URL"""
+
+    def __init__(self, path='.detail_cache.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(DETAIL_SCHEMA)
+        self.hits = 0
+        self.unchanged_bodies = 0
+        self.parsed = 0
+
+    def get(self, url_key):
+        """(listing_hash, body_hash, details) for a URL, or None"""
+        row = self.conn.execute(
+            'SELECT listing_hash, body_hash, details FROM details WHERE url_key = ?', (url_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], _load_details(row[2])
+
+    def put(self, url_key, listing, body_hash, details):
+        with self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO details (url_key, listing_hash, body_hash, details, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url_key, listing, body_hash, _dump_details(details),
+                 datetime.now().isoformat(timespec='seconds')),
+            )
+
+    def print_stats(self):
+        print(f"🧾 Detail pages: {self.hits} unchanged listings skipped, "
+              f"{self.unchanged_bodies} unchanged pages not re-parsed, {self.parsed} parsed")
+
+    def close(self):
+        self.conn.close()
+
+
+def _dump_details(details):
+    posted = details.get('posted')
+    return json.dumps(dict(details, posted=posted.isoformat() if posted else None))
+
+
+def _load_details(text):
+    details = json.loads(text)
+    details['posted'] = parse_iso_date(details.get('posted'))
+    if details.get('experience'):
+        details['experience'] = tuple(details['experience'])
+    return details
+
+
+class DetailEnricher:
+    """Fetches result detail pages through a small worker pool and parses them.
+
+    ``tasks(records, on_details)`` yields a fetch task for every record
+    whose details are not cached and calls ``on_details(record, details)``
+    straight away for those that are.  ``details`` holds ``posted`` (a
+    date or None), ``experience`` (``(low, high)`` or None), ``salary`` (a
+    string or None) and ``skills`` (a list of display names).
+    """
+
+    def __init__(self, cache=None, max_workers=4, max_pages=None):
+        self.cache = cache
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+
+    def tasks(self, records, on_details):
+        budget = self.max_pages
+        for record in records:
+            url_key = normalize_url(record['Job URL'])
+            listing = listing_hash(record)
+            cached = self.cache.get(url_key) if self.cache else None
+            if cached and cached[0] == listing:
+                self.cache.hits += 1
+                on_details(record, cached[2])
+                continue
+            if budget is not None:
+                if budget <= 0:
+                    break
+                budget -= 1
+            yield FetchTask(
+                record['Job URL'],
+                lambda response, record=record, url_key=url_key, listing=listing, cached=cached:
+                    self.handle_page(record, url_key, listing, cached, response, on_details),
+                source='Detail pages',
+            )
+
+    def handle_page(self, record, url_key, listing, cached, response, on_details):
+        if response.status_code != 200:
+            return None
+        body_hash = hashlib.sha1(response.content).hexdigest()
+        if cached and cached[1] == body_hash:
+            details = cached[2]
+            if self.cache:
+                self.cache.unchanged_bodies += 1
+        else:
+            details = parse_detail(response.content)
+            if self.cache:
+                self.cache.parsed += 1
+        if self.cache:
+            self.cache.put(url_key, listing, body_hash, details)
+        on_details(record, details)
+        return None
+
+
+def parse_detail(content, today=None):
+    """Posting date, experience, salary and skills of a job detail page"""
+    details = dict.fromkeys(DETAIL_FIELDS)
+    details['skills'] = []
+    for posting in json_ld_postings(content):
+        details['posted'] = details['posted'] or parse_iso_date(posting.get('datePosted'))
+        details['experience'] = details['experience'] or json_ld_experience(posting.get('experienceRequirements'))
+        details['salary'] = details['salary'] or json_ld_salary(posting.get('baseSalary'))
+        skills = posting.get('skills')
+        if skills:
+            details['skills'] = find_skills(skills if isinstance(skills, str) else ', '.join(skills))
+
+    soup = make_soup(content)
+    if not details['posted']:
+        meta = soup.find('meta', attrs={'property': 'article:published_time'}) or soup.find(attrs={'itemprop': 'datePosted'})
+        if meta:
+            details['posted'] = parse_iso_date(meta.get('content') or meta.get('datetime') or meta.get_text())
+    text = soup.get_text(' ', strip=True)
+    if not details['posted']:
+        for match in POSTED_PATTERN.finditer(text):
+            age = match.group(1) or match.group(2)
+            details['posted'] = parse_iso_date(age) or parse_posted_date(age, today)
+            if details['posted']:
+                break
+    if not details['experience']:
+        ranges = experience_ranges(text.lower())
+        details['experience'] = ranges[0] if ranges else None
+    if not details['salary']:
+        match = SALARY_PATTERN.search(text)
+        details['salary'] = ' '.join(match.group(0).split()) if match else None
+    if not details['skills']:
+        details['skills'] = find_skills(text)
+    return details
+
+
+def find_skills(text):
+    """Distinct skill display names mentioned in a text, in order of appearance"""
+    found = {}
+    for word in SKILL_PATTERN.findall(text.lower()):
+        found.setdefault(SKILLS[word], None)
+    return list(found)
+
+
+def json_ld_experience(value):
+    """(low, high) years from a JobPosting experienceRequirements value"""
+    if isinstance(value, dict):
+        months = value.get('monthsOfExperience')
+        if months is not None:
+            try:
+                years = int(float(months) // 12)
+            except (TypeError, ValueError):
+                return None
+            return (years, None)
+        value = value.get('description')
+    if isinstance(value, str):
+        ranges = experience_ranges(value.lower())
+        return ranges[0] if ranges else None
+    return None
+
+
+def json_ld_salary(value):
+    """Readable salary from a JobPosting baseSalary value"""
+    if not isinstance(value, dict):
+        return str(value) if value else None
+    currency = value.get('currency', '')
+    amount = value.get('value')
+    if isinstance(amount, dict):
+        unit = amount.get('unitText', '')
+        low, high = amount.get('minValue'), amount.get('maxValue')
+        number = f"{low}-{high}" if low is not None and high is not None else amount.get('value', low or high)
+        if number is None:
+            return None
+        return ' '.join(str(part) for part in (currency, number, f"/ {unit}" if unit else '') if part)
+    return f"{currency} {amount}".strip() if amount is not None else None
+
+
+def format_experience(experience):
+    if not experience:
+        return ''
+    low, high = experience
+    return f"{low}+ yrs" if high is None else f"{low}-{high} yrs"
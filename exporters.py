@@ -0,0 +1,230 @@
+import csv
+import heapq
+import json
+import os
+import socket
+import tempfile
+from itertools import islice
+from urllib.parse import urlsplit
+
+
+FIELDNAMES = ['Job Title', 'Company Name', 'Location', 'Job URL', 'Posting Date', 'Source', 'Source URLs',
+              'Experience', 'Salary', 'Skills']
+
+
+class CsvSink:
+    """Writes each record to a CSV file as soon as it arrives"""
+
+    fmt = 'csv'
+
+    def __init__(self, path, fieldnames=FIELDNAMES, autoflush=True):
+        self.path = path
+        self.count = 0
+        self.autoflush = autoflush
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+        self._writer.writeheader()
+        self._file.flush()
+
+    def write(self, record):
+        self._writer.writerow(record)
+        if self.autoflush:
+            self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+class JsonlSink:
+    """Writes each record as one JSON line as soon as it arrives"""
+
+    fmt = 'jsonl'
+
+    def __init__(self, path, autoflush=True):
+        self.path = path
+        self.count = 0
+        self.autoflush = autoflush
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=dict) + '\n')
+        if self.autoflush:
+            self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+class WebhookSink:
+    """POSTs each record as JSON to a URL; failed deliveries are reported, not raised"""
+
+    def __init__(self, url, timeout=10):
+        self.path = url
+        self.count = 0
+        self.failures = 0
+        self.timeout = timeout
+        # Only webhooks need requests; file sinks start without it
+        import requests
+
+        self._session = requests.Session()
+        self._errors = requests.RequestException
+
+    def write(self, record):
+        try:
+            self._session.post(self.path, json=dict(record), timeout=self.timeout).raise_for_status()
+        except self._errors as e:
+            self.failures += 1
+            print(f"   Webhook {self.path} failed: {e}")
+            return
+        self.count += 1
+
+    def close(self):
+        self._session.close()
+
+
+class SocketSink:
+    """Sends each record as one JSON line to a local socket listener.
+
+    ``address`` is ``(host, port)`` for TCP or a path for a Unix socket.
+    The connection is opened on the first write and again after an error.
+    """
+
+    def __init__(self, address):
+        self.address = address
+        self.path = address if isinstance(address, str) else f'{address[0]}:{address[1]}'
+        self.count = 0
+        self.failures = 0
+        self._sock = None
+
+    def _connect(self):
+        if not isinstance(self.address, str):
+            return socket.create_connection(self.address, timeout=10)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(10)
+        sock.connect(self.address)
+        return sock
+
+    def write(self, record):
+        line = (json.dumps(record, ensure_ascii=False, default=dict) + '\n').encode('utf-8')
+        try:
+            if self._sock is None:
+                self._sock = self._connect()
+            self._sock.sendall(line)
+        except OSError as e:
+            self.failures += 1
+            print(f"   Socket {self.path} failed: {e}")
+            self.close()
+            return
+        self.count += 1
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+def format_for(path):
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+def open_sink(path, fmt=None, autoflush=True):
+    """Open a streaming sink, picking the format from the file extension by default"""
+    if (fmt or format_for(path)) == 'jsonl':
+        return JsonlSink(path, autoflush=autoflush)
+    return CsvSink(path, autoflush=autoflush)
+
+
+def open_match_sink(target):
+    """Sink for a notification target: http(s):// URL, tcp://host:port, unix:///path or a file"""
+    parts = urlsplit(target)
+    if parts.scheme in ('http', 'https'):
+        return WebhookSink(target)
+    if parts.scheme == 'tcp':
+        return SocketSink((parts.hostname, parts.port))
+    if parts.scheme == 'unix':
+        return SocketSink(parts.path)
+    return open_sink(target)
+
+
+def read_records(path, fmt=None):
+    """Stream records back from a CSV or JSONL export"""
+    with open(path, newline='', encoding='utf-8') as f:
+        if (fmt or format_for(path)) == 'jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _read_run(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def external_sort(records, key, reverse=False, chunk_size=50000):
+    """Sort a record stream holding at most ``chunk_size`` records in memory.
+
+    Each chunk is sorted and spilled to a temporary JSONL run; the runs are
+    then merged lazily.  Streams that fit in one chunk never touch disk.
+    """
+    records = iter(records)
+    first = sorted(islice(records, chunk_size), key=key, reverse=reverse)
+    if len(first) < chunk_size:
+        yield from first
+        return
+
+    run_dir = tempfile.mkdtemp(prefix='jobsort_')
+    runs = []
+    readers = []
+    try:
+        chunk = first
+        while chunk:
+            path = os.path.join(run_dir, f'run{len(runs)}.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                for record in chunk:
+                    f.write(json.dumps(record, ensure_ascii=False, default=dict) + '\n')
+            runs.append(path)
+            chunk = sorted(islice(records, chunk_size), key=key, reverse=reverse)
+        readers = [_read_run(path) for path in runs]
+        yield from heapq.merge(*readers, key=key, reverse=reverse)
+    finally:
+        for reader in readers:
+            reader.close()
+        for path in runs:
+            os.remove(path)
+        os.rmdir(run_dir)
+
+
+def _updated(records, update, drop):
+    for record in records:
+        if drop and drop(record):
+            continue
+        if update:
+            update(record)
+        yield record
+
+
+def sort_file(path, key, reverse=False, fmt=None, chunk_size=50000, update=None, drop=None):
+    """Re-order an export file in place with a bounded-memory external sort.
+
+    ``update`` (optional) is called on each record before it is sorted;
+    records for which ``drop`` (optional) returns true are left out.
+    Returns the number of records written.
+    """
+    fmt = fmt or format_for(path)
+    sorted_path = path + '.sorting'
+    sink = open_sink(sorted_path, fmt, autoflush=False)
+    records = read_records(path, fmt)
+    if update or drop:
+        records = _updated(records, update, drop)
+    try:
+        for record in external_sort(records, key, reverse, chunk_size):
+            sink.write(record)
+    finally:
+        sink.close()
+    os.replace(sorted_path, path)
+    return sink.count
@@ -0,0 +1,346 @@
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlsplit
+
+import requests
+
+from http_cache import SessionPool
+from instrumentation import RequestTiming, connection_timing, reset_connection_timing
+from rate_limit import HostPolicy, RetryPolicy, parse_retry_after
+
+
+class FetchTask:
+    """A single URL to fetch plus the callbacks that consume the response"""
+
+    def __init__(self, url, on_response, on_error=None, headers=None, timeout=10, source=None, query=None):
+        self.url = url
+        self.source = source
+        self.query = query
+        self.on_response = on_response
+        self.on_error = on_error
+        self.headers = headers
+        self.timeout = timeout
+        self.host = urlsplit(url).netloc.lower()
+        self.attempts = 0
+
+
+class Pending:
+    """Returned by a callback whose work finishes on another stage.
+
+    Once ``future`` is done, ``then(result)`` runs on the dispatcher thread
+    and returns the follow-up tasks, as a callback would have.  A ``timed``
+    future returns ``(seconds, result)``, the seconds it spent working,
+    which count towards the task's parse time.
+    """
+
+    __slots__ = ('future', 'then', 'timed')
+
+    def __init__(self, future, then=None, timed=False):
+        self.future = future
+        self.then = then or (lambda result: result)
+        self.timed = timed
+
+    def chain(self, step):
+        """A Pending that runs ``step`` on what this one's ``then`` returns"""
+        then = self.then
+        return Pending(self.future, lambda result: step(then(result)), self.timed)
+
+
+class _HostState:
+    def __init__(self, policy):
+        self.policy = policy
+        self.limiter = policy.limiter()
+        # (not_before, seq, task): retries wait here without holding a worker
+        self.queue = []
+        self.active = 0
+        self.throttled = 0
+
+    def ready_at(self, now):
+        """When the next queued task may start, or None if the host is saturated"""
+        if not self.queue or self.active >= self.policy.max_concurrency:
+            return None
+        ready = self.queue[0][0]
+        if self.limiter:
+            ready = max(ready, self.limiter.bucket.ready_at(now))
+        return ready
+
+    def can_start(self, now):
+        ready = self.ready_at(now)
+        return ready is not None and ready <= now
+
+    def priority(self):
+        # Hosts that have not been throttled and answer quickly go first
+        latency = self.limiter.latency if self.limiter and self.limiter.latency is not None else 0.0
+        return (self.throttled, latency)
+
+
+class FetchEngine:
+    """Runs fetch tasks concurrently with a separate limit for every host.
+
+    Requests are dispatched from the calling thread onto a worker pool only
+    when their host has a free slot and a token in its rate bucket, so a
+    slow or heavily throttled host never ties up workers that another host
+    could use; when workers are scarce, healthy hosts are served first.
+    Each host's rate adapts to its responses (see ``rate_limit``), and
+    429/5xx responses or connection errors are retried after a jittered
+    backoff (or ``Retry-After``).  Callbacks run on the calling thread as
+    responses arrive and may return further tasks to enqueue.
+
+    Connections are kept alive in one pooled session per host, and when an
+    ``HttpCache`` is given every request is sent as a conditional GET.
+    With ``RunMetrics`` attached, every request and callback is timed.
+
+    For offline runs, ``base_url`` sends every request to that origin
+    instead, with the original host in the ``Host`` header, and a
+    ``recorder`` (see ``replay.FixtureArchive``) is handed each response.
+
+    A callback may hand its work to another stage by returning a ``Pending``
+    (see ``parse_pool.ParsePool``).  While ``max_pending`` of those are
+    unfinished no new request is started, so fetching cannot run ahead of
+    that stage; ``stalls`` counts the dispatch rounds held back that way.
+    """
+
+    def __init__(self, host_policies=None, default_policy=None, max_workers=16, headers=None,
+                 cache=None, metrics=None, retry=None, base_url=None, recorder=None, max_pending=None):
+        self.host_policies = dict(host_policies or {})
+        self.default_policy = default_policy or HostPolicy()
+        self.max_workers = max_workers
+        self.sessions = SessionPool(headers)
+        self.cache = cache
+        self.metrics = metrics
+        self.retry = retry or RetryPolicy()
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.recorder = recorder
+        self.max_pending = max_pending
+        self.stalls = 0
+
+    def policy_for(self, host):
+        return self.host_policies.get(host, self.default_policy)
+
+    def fetch(self, task):
+        """Perform the HTTP request for a task (runs on a worker thread)"""
+        session = self.sessions.get(task.host, self.policy_for(task.host).max_concurrency)
+        headers = dict(task.headers or {})
+        if self.cache:
+            headers.update(self.cache.conditional_headers(task.url))
+        url = task.url
+        if self.base_url:
+            parts = urlsplit(task.url)
+            url = self.base_url + (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+            headers['Host'] = parts.netloc
+        timing = RequestTiming(task.source, task.query, task.url)
+        timing.retries = task.attempts
+        reset_connection_timing()
+        start = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers, timeout=task.timeout, stream=True)
+            headers_received = time.perf_counter()
+            content = response.content
+            finished = time.perf_counter()
+        except Exception as e:
+            timing.dns, timing.connect = connection_timing()
+            timing.error = type(e).__name__
+            self._record(timing)
+            raise
+        timing.dns, timing.connect = connection_timing()
+        timing.ttfb = max(0.0, headers_received - start - timing.dns - timing.connect)
+        timing.download = finished - headers_received
+        timing.bytes = response.raw.tell() or len(content)
+        timing.status = response.status_code
+        if self.base_url:
+            response.url = task.url
+        if self.cache and response.status_code not in self.retry.statuses:
+            response = self.cache.resolve(task.url, response)
+            timing.from_cache = response.from_cache
+        if self.recorder is not None and response.status_code not in self.retry.statuses:
+            self.recorder.record(task.url, response)
+        self._record(timing)
+        return response
+
+    def _handle_response(self, task, response):
+        """Run a task's callback, timing it as the parse stage"""
+        return self._timed(task, task.on_response, response)
+
+    def _timed(self, task, callback, arg, elapsed=0.0):
+        parse_start = time.perf_counter()
+        try:
+            return callback(arg)
+        except Exception as e:
+            self._fail(task, e)
+            return None
+        finally:
+            if self.metrics:
+                self.metrics.record_parse(task.source, task.query, elapsed + time.perf_counter() - parse_start)
+
+    def _finish_pending(self, task, pending):
+        """Run a finished Pending's continuation, timing it as the parse stage"""
+        try:
+            result = pending.future.result()
+        except Exception as e:
+            self._fail(task, e)
+            return None
+        elapsed = 0.0
+        if pending.timed:
+            elapsed, result = result
+        return self._timed(task, pending.then, result, elapsed)
+
+    def _fail(self, task, error):
+        if self.metrics:
+            self.metrics.record_error(task.source, task.query, error)
+        if task.on_error:
+            task.on_error(error)
+
+    def _record(self, timing):
+        if self.metrics:
+            self.metrics.record_request(timing)
+
+    def run(self, tasks, max_workers=None):
+        """Fetch every task, invoking its callbacks; returns the number fetched.
+
+        ``max_workers`` caps this run's worker pool below the engine default.
+        """
+        max_workers = min(max_workers or self.max_workers, self.max_workers)
+        hosts = {}
+        in_flight = {}
+        # Callbacks finishing on another stage: future -> (task, Pending)
+        pending = {}
+        sequence = itertools.count()
+        completed = 0
+
+        def enqueue(new_tasks, not_before=0.0):
+            for task in new_tasks or ():
+                state = hosts.get(task.host)
+                if state is None:
+                    state = hosts[task.host] = _HostState(self.policy_for(task.host))
+                heapq.heappush(state.queue, (not_before, next(sequence), task))
+
+        def retry_later(task, retry_after=None):
+            delay = self.retry.delay(task.attempts, retry_after)
+            task.attempts += 1
+            enqueue([task], time.monotonic() + delay)
+
+        enqueue(tasks)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while True:
+                now = time.monotonic()
+                ready = [s for s in hosts.values() if s.can_start(now)]
+                blocked = self.max_pending is not None and len(pending) >= self.max_pending
+                if blocked and ready:
+                    self.stalls += 1
+                    ready = []
+                for state in sorted(ready, key=_HostState.priority):
+                    while len(in_flight) < max_workers and state.can_start(now):
+                        _, _, task = heapq.heappop(state.queue)
+                        state.active += 1
+                        if state.limiter:
+                            state.limiter.bucket.take(now)
+                        in_flight[pool.submit(self.fetch, task)] = (task, state)
+                waiting = [s.ready_at(now) for s in hosts.values()]
+                next_ready = min((t for t in waiting if t is not None), default=None)
+
+                if not in_flight and not pending:
+                    if next_ready is None:
+                        break
+                    time.sleep(max(0.0, next_ready - now))
+                    continue
+
+                timeout = None
+                if next_ready is not None and len(in_flight) < max_workers and not blocked:
+                    timeout = max(0.0, next_ready - now)
+
+                done, _ = wait(list(in_flight) + list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in pending:
+                        enqueue(self._finish_pending(*pending.pop(future)))
+                        continue
+                    task, state = in_flight.pop(future)
+                    state.active -= 1
+                    completed += 1
+                    try:
+                        response = future.result()
+                    except Exception as e:
+                        if state.limiter:
+                            state.limiter.on_failure()
+                        if isinstance(e, requests.RequestException) and self.retry.should_retry(task.attempts):
+                            retry_later(task)
+                        elif task.on_error:
+                            task.on_error(e)
+                        continue
+
+                    status = response.status_code
+                    if state.limiter:
+                        state.limiter.on_response(status, response.elapsed.total_seconds())
+                    if status in self.retry.statuses:
+                        state.throttled += 1
+                        if self.retry.should_retry(task.attempts, status):
+                            retry_later(task, parse_retry_after(response.headers.get('Retry-After')))
+                        else:
+                            self._fail(task, requests.HTTPError(
+                                f'{status} from {task.host} after {task.attempts} retries', response=response
+                            ))
+                        continue
+                    if state.throttled:
+                        state.throttled -= 1
+                    result = self._handle_response(task, response)
+                    if isinstance(result, Pending):
+                        pending[result.future] = (task, result)
+                    else:
+                        enqueue(result)
+
+        return completed
+
+
+class PagedCrawl:
+    """Fetches result pages of one query through a sliding window.
+
+    Up to ``window`` pages are in flight at once.  ``on_page`` parses a
+    response and returns how many fresh listings it held; the first page
+    with none stops the crawl, so depth follows the number of new postings
+    instead of ``max_pages``.
+    """
+
+    def __init__(self, page_url, on_page, max_pages=3, window=2, on_error=None, source=None, query=None):
+        self.page_url = page_url
+        self.source = source
+        self.query = query
+        self.on_page = on_page
+        self.max_pages = max_pages
+        self.window = max(1, min(window, max_pages))
+        self.on_error = on_error
+        self.next_page = self.window + 1
+        self.done = False
+
+    def tasks(self):
+        return [self._task(page) for page in range(1, self.window + 1)]
+
+    def _task(self, page):
+        return FetchTask(
+            self.page_url(page),
+            lambda response: self._handle(response),
+            on_error=self._fail,
+            source=self.source,
+            query=self.query,
+        )
+
+    def _handle(self, response):
+        fresh = self.on_page(response)
+        if isinstance(fresh, Pending):
+            return fresh.chain(self._next)
+        return self._next(fresh)
+
+    def _next(self, fresh):
+        if not fresh:
+            self.done = True
+        if self.done or self.next_page > self.max_pages:
+            return None
+        page = self.next_page
+        self.next_page += 1
+        return [self._task(page)]
+
+    def _fail(self, error):
+        self.done = True
+        if self.on_error:
+            self.on_error(error)
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+
+import requests
+
+from instrumentation import TimedHTTPAdapter
+
+
+class SessionPool:
+    """One keep-alive requests.Session per host, sized to its concurrency"""
+
+    def __init__(self, headers=None):
+        self.headers = dict(headers or {})
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, host, pool_size=2):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+class HttpCache:
+    """On-disk HTTP cache that revalidates with ETag / Last-Modified.
+
+    Each URL is stored as a ``<sha1>.json`` metadata file next to a
+    ``<sha1>.body`` file holding the raw response bytes.
+    """
+
+    def __init__(self, directory='.http_cache'):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return base + '.json', base + '.body'
+
+    def _load_meta(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or not os.path.exists(body_path):
+            return None
+        return meta
+
+    def conditional_headers(self, url):
+        """Validators to send with a request for a cached URL"""
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url, response):
+        """Save a 200 response that carries a validator"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+        meta_path, body_path = self._paths(url)
+        with open(body_path, 'wb') as f:
+            f.write(response.content)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': {
+                    key: value for key, value in response.headers.items()
+                    if key.lower() not in ('content-encoding', 'transfer-encoding', 'content-length')
+                },
+                'encoding': response.encoding,
+            }, f)
+
+    def resolve(self, url, response):
+        """Return the response to hand to callers, serving the cached body on 304"""
+        if response.status_code == 304:
+            meta = self._load_meta(url)
+            if meta:
+                _, body_path = self._paths(url)
+                with open(body_path, 'rb') as f:
+                    body = f.read()
+                with self._lock:
+                    self.hits += 1
+                    self.bytes_saved += len(body)
+                cached = requests.Response()
+                cached.status_code = 200
+                cached.url = url
+                cached.headers.update(meta.get('headers') or {})
+                cached.encoding = meta.get('encoding')
+                cached._content = body
+                cached.request = response.request
+                cached.elapsed = response.elapsed
+                cached.from_cache = True
+                return cached
+        with self._lock:
+            self.misses += 1
+        self.store(url, response)
+        response.from_cache = False
+        return response
+
+    def print_stats(self):
+        total = self.hits + self.misses
+        print(f"🗄️  HTTP cache: {self.hits} hits / {self.misses} misses "
+              f"({self.hits * 100 // total if total else 0}% revalidated), "
+              f"{self.bytes_saved / 1024:.1f} KiB saved")
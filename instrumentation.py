@@ -0,0 +1,276 @@
+import json
+import socket
+import threading
+import time
+from datetime import datetime
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import connection as urllib3_connection
+
+# Connection-level timings of the request running on the current thread
+_connection_timing = threading.local()
+
+
+class _TimedResolver:
+    """Stands in for the ``socket`` module inside ``urllib3.util.connection``.
+
+    While a timed connection is being opened on this thread, the time of
+    urllib3's own ``getaddrinfo`` call is added to the DNS timing, so the
+    host is looked up once and urllib3 still tries every address it gets.
+    """
+
+    def __getattr__(self, name):
+        return getattr(socket, name)
+
+    def getaddrinfo(self, *args, **kwargs):
+        if not getattr(_connection_timing, 'opening', False):
+            return socket.getaddrinfo(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return socket.getaddrinfo(*args, **kwargs)
+        finally:
+            _connection_timing.dns = getattr(_connection_timing, 'dns', 0.0) + time.perf_counter() - start
+
+
+urllib3_connection.socket = _TimedResolver()
+
+
+class _TimedConnectionMixin:
+    """Records DNS and connect (TCP + TLS) time when a new connection is opened"""
+
+    def _new_conn(self):
+        _connection_timing.opening = True
+        try:
+            return super()._new_conn()
+        finally:
+            _connection_timing.opening = False
+
+    def connect(self):
+        start = time.perf_counter()
+        dns_before, connect_before = connection_timing()
+        super().connect()
+        elapsed = time.perf_counter() - start
+        dns = connection_timing()[0]
+        _connection_timing.dns = dns
+        _connection_timing.connect = connect_before + elapsed - (dns - dns_before)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report DNS and connect times"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+def reset_connection_timing():
+    _connection_timing.dns = 0.0
+    _connection_timing.connect = 0.0
+
+
+def connection_timing():
+    """(dns, connect) seconds spent opening connections on this thread"""
+    return getattr(_connection_timing, 'dns', 0.0), getattr(_connection_timing, 'connect', 0.0)
+
+
+class RequestTiming:
+    """Timings and outcome of one HTTP request"""
+
+    __slots__ = ('source', 'query', 'url', 'status', 'dns', 'connect', 'ttfb',
+                 'download', 'bytes', 'retries', 'error', 'from_cache')
+
+    def __init__(self, source, query, url):
+        self.source = source
+        self.query = query
+        self.url = url
+        self.status = None
+        self.dns = 0.0
+        self.connect = 0.0
+        self.ttfb = 0.0
+        self.download = 0.0
+        self.bytes = 0
+        self.retries = 0
+        self.error = None
+        self.from_cache = False
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StageStats:
+    """Totals for one (source, query) pair"""
+
+    STAGES = ('dns', 'connect', 'ttfb', 'download', 'parse')
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.bytes = 0
+        self.cards_found = 0
+        self.cards_kept = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.errors = {}
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'seconds': {stage: round(value, 6) for stage, value in self.seconds.items()},
+            'bytes': self.bytes,
+            'cards_found': self.cards_found,
+            'cards_kept': self.cards_kept,
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'errors': dict(self.errors),
+        }
+
+
+class RunMetrics:
+    """Collects per-source, per-query timings for a run and exports them"""
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.finished_at = None
+        self.wall_seconds = None
+        self.requests = []
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, source, query):
+        key = (source or 'unknown', query or '')
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = StageStats()
+        return stats
+
+    def record_request(self, timing):
+        with self._lock:
+            self.requests.append(timing)
+            stats = self._stats(timing.source, timing.query)
+            stats.requests += 1
+            for stage in ('dns', 'connect', 'ttfb', 'download'):
+                stats.seconds[stage] += getattr(timing, stage)
+            stats.bytes += timing.bytes
+            # A request's ``retries`` is its attempt number; each retried request counts once
+            stats.retries += timing.retries > 0
+            stats.cache_hits += timing.from_cache
+            if timing.error:
+                stats.errors[timing.error] = stats.errors.get(timing.error, 0) + 1
+
+    def record_parse(self, source, query, seconds):
+        with self._lock:
+            self._stats(source, query).seconds['parse'] += seconds
+
+    def record_cards(self, source, query, found, kept):
+        with self._lock:
+            stats = self._stats(source, query)
+            stats.cards_found += found
+            stats.cards_kept += kept
+
+    def record_error(self, source, query, error):
+        with self._lock:
+            errors = self._stats(source, query).errors
+            name = type(error).__name__
+            errors[name] = errors.get(name, 0) + 1
+
+    def finish(self):
+        self.finished_at = datetime.now()
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def report(self):
+        """The run as a JSON-serialisable dict"""
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'finished_at': self.finished_at.isoformat(timespec='seconds') if self.finished_at else None,
+            'wall_seconds': round(self.wall_seconds, 3) if self.wall_seconds is not None else None,
+            'sources': [
+                dict(source=source, query=query, **stats.to_dict())
+                for (source, query), stats in sorted(self.stats.items())
+            ],
+            'requests': [timing.to_dict() for timing in self.requests],
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return path
+
+    def prometheus(self, prefix='jobskrapp'):
+        """The run totals in Prometheus text exposition format"""
+        metrics = [
+            ('requests_total', 'counter', 'HTTP requests sent', lambda s: [({}, s.requests)]),
+            ('stage_seconds_total', 'counter', 'Seconds spent per pipeline stage',
+             lambda s: [({'stage': stage}, value) for stage, value in s.seconds.items()]),
+            ('bytes_total', 'counter', 'Response bytes received', lambda s: [({}, s.bytes)]),
+            ('cards_found_total', 'counter', 'Job cards found on result pages', lambda s: [({}, s.cards_found)]),
+            ('cards_kept_total', 'counter', 'Job cards kept as results', lambda s: [({}, s.cards_kept)]),
+            ('retries_total', 'counter', 'Request retries', lambda s: [({}, s.retries)]),
+            ('cache_hits_total', 'counter', 'Responses served from the HTTP cache', lambda s: [({}, s.cache_hits)]),
+            ('errors_total', 'counter', 'Errors by class',
+             lambda s: [({'error': name}, count) for name, count in s.errors.items()]),
+        ]
+        lines = []
+        for name, kind, help_text, samples in metrics:
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} {kind}')
+            for (source, query), stats in sorted(self.stats.items()):
+                for extra, value in samples(stats):
+                    labels = dict(source=source, query=query, **extra)
+                    label_text = ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+                    lines.append(f'{prefix}_{name}{{{label_text}}} {value}')
+        if self.wall_seconds is not None:
+            lines.append(f'# HELP {prefix}_run_seconds Wall-clock duration of the run')
+            lines.append(f'# TYPE {prefix}_run_seconds gauge')
+            lines.append(f'{prefix}_run_seconds {self.wall_seconds:.6f}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+        return path
+
+    def print_summary(self):
+        """Per-source totals, slowest first"""
+        totals = {}
+        for (source, _), stats in self.stats.items():
+            total = totals.setdefault(source, StageStats())
+            total.requests += stats.requests
+            total.cards_found += stats.cards_found
+            total.cards_kept += stats.cards_kept
+            for stage, value in stats.seconds.items():
+                total.seconds[stage] += value
+            for name, count in stats.errors.items():
+                total.errors[name] = total.errors.get(name, 0) + count
+        print("⏱️  Time by source (network = dns + connect + ttfb + download):")
+        for source, total in sorted(totals.items(), key=lambda item: -sum(item[1].seconds.values())):
+            network = sum(total.seconds[stage] for stage in ('dns', 'connect', 'ttfb', 'download'))
+            errors = sum(total.errors.values())
+            print(f"   {source:<22} {total.requests:>3} req  network {network:6.2f}s  "
+                  f"parse {total.seconds['parse']:6.2f}s  cards {total.cards_kept}/{total.cards_found}"
+                  + (f"  errors {errors}" if errors else ""))
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,243 +1,368 @@
-import requests
-import csv
-import json
+import os
 from datetime import datetime, timedelta
-import time
-from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
+from functools import partial
+from itertools import chain
+from urllib.parse import quote_plus, urljoin
 import re
 
+from dedup import NearDuplicateIndex, normalize_url, title_company_key
+from exporters import CsvSink, external_sort, open_sink, sort_file
+from fetch_engine import FetchEngine, HostPolicy, PagedCrawl
+from http_cache import HttpCache
+from instrumentation import RunMetrics
+from job_store import JobStore
+from profiles import (DEFAULT_PROFILE, PROFILE_FILE, labelled_searches, linkedin_jobs_searches,
+                      linkedin_searches, load_profiles, open_profile_sink, union_matcher)
+from results import ResultTable
+from sources import COMPANY_PAGES, SOURCES, host_policies
+
+DEFAULT_HOST_POLICY = HostPolicy(max_concurrency=2, min_interval=2.0)
+# Rows that are search links to open by hand rather than postings
+SEARCH_LINK_SOURCES = ('LinkedIn Search Link', 'LinkedIn Jobs Search')
+# Stored postings last seen this recently are matched against for near-duplicates
+NEAR_DUPLICATE_WINDOW_DAYS = 30
+
+def posting_date_key(job):
+    return job['Posting Date']
+
 class JobSearcher:
-    def __init__(self):
-        self.results = []
+    def __init__(self, engine=None, dedupe_by_title=True, cache_dir='.http_cache',
+                 max_pages=3, page_window=2, max_age_days=0, store=None, matcher=None, sink=None,
+                 near_duplicates=True, enricher=None, crawl_state='.company_crawl_state.json', profiles=None,
+                 parse_pool=None):
+        self.results = ResultTable()
+        self.sink = sink
+        # Every profile's searches run once; the matcher keeps what any of them might want
+        self.profiles = profiles or [DEFAULT_PROFILE]
+        self.matcher = matcher or union_matcher(self.profiles)
+        self.store = store
+        self.known_urls = store.known_url_keys() if store else set()
+        self.seen_known = set()
+        self.new_results = []
+        self.dedupe_by_title = dedupe_by_title
+        self.max_pages = max_pages
+        self.page_window = page_window
+        self.max_age_days = max_age_days
+        self.url_index = set()
+        self.title_index = set()
+        # Result pages parsed by this process; a revalidated (304) copy of one holds nothing new
+        self.parsed_pages = set()
+        # Same opening listed with different wording, this run and in earlier runs
+        self.near_duplicates = near_duplicates
+        self.near_dup_index = NearDuplicateIndex()
+        # Index of the stored postings, built on the first posting that needs it
+        self._stored_near_dups = None
+        self.enricher = enricher
+        # Fields changed after a record was streamed to the sink, by Job URL
+        self.record_updates = {}
+        # URLs of streamed records dropped since (e.g. dated before the cutoff by their detail page)
+        self.dropped_urls = set()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        self.engine = engine or FetchEngine(
+            host_policies(),
+            DEFAULT_HOST_POLICY,
+            headers=self.headers,
+            cache=HttpCache(cache_dir) if cache_dir else None,
+            metrics=RunMetrics(),
+        )
+        if self.engine.metrics is None:
+            self.engine.metrics = RunMetrics()
+        self.metrics = self.engine.metrics
+        # Results pages are parsed in worker processes when a ParsePool is given
+        self.parse_pool = parse_pool.attach(self.engine) if parse_pool else None
+        # Only runs searching company pages build (and import) the crawler
+        self.crawl_state = crawl_state
+        self._company_crawler = None
+        
+    @property
+    def company_crawler(self):
+        if self._company_crawler is None:
+            from company_crawler import CompanyCrawler
+            
+            self._company_crawler = CompanyCrawler(
+                self.handle_company_posting, state_path=self.crawl_state, on_error=self.report_company_error
+            )
+        return self._company_crawler
+    
+    @property
+    def stored_near_dups(self):
+        """Near-duplicate index of the postings stored recently, or None without a store"""
+        if self._stored_near_dups is None and self.store and self.near_duplicates:
+            self._stored_near_dups = NearDuplicateIndex()
+            since = (datetime.now() - timedelta(days=NEAR_DUPLICATE_WINDOW_DAYS)).isoformat(timespec='seconds')
+            for url_key, job_title, company_name, location in self.store.dedup_rows(since):
+                self._stored_near_dups.add(job_title, company_name, location or '', url_key)
+        return self._stored_near_dups
+        
+    def search_source(self, key):
+        """Search one registered source (see sources.py)"""
+        self.engine.run(self.source_tasks(SOURCES[key]))
+    
+    def source_tasks(self, spec):
+        """Build the fetch tasks for every distinct query and city the profiles search on a source"""
+        print(f"🔍 Searching {spec.name}...")
         
-    def search_naukri_jobs(self):
-        """Search for jobs on Naukri.com"""
-        print("🔍 Searching Naukri.com...")
-        
-        search_queries = [
-            "React Developer Bangalore",
-            "Frontend Developer Bangalore", 
-            "Full Stack Developer Bangalore"
-        ]
-        
-        for query in search_queries:
+        for label, query, city in labelled_searches(spec, self.profiles):
+            print(f"   Searching: {label}")
+            
+            yield from self.paged_tasks(
+                partial(spec.page_url, query, city=city),
+                partial(self.handle_results_page, spec, label, city=city),
+                partial(self.report_search_error, spec.name, label),
+                spec.name,
+                label,
+                spec.max_pages,
+            )
+    
+    def handle_results_page(self, spec, query, response, city=None):
+        """Extract job cards from a search results page; returns the fresh card count.
+        
+        With a parse pool the page is parsed in a worker and a ``Pending``
+        fresh count is returned instead.
+        """
+        if response.status_code != 200:
+            return 0
+        if getattr(response, 'from_cache', False) and response.url in self.parsed_pages:
+            return 0
+        self.parsed_pages.add(response.url)
+        
+        handle = partial(self.handle_cards, spec, query, city=city)
+        if self.parse_pool:
+            return self.parse_pool.submit(spec.extractor, response.content).chain(handle)
+        # Find job listings, building only the card subtrees
+        return handle(spec.extract_page(response.content))
+    
+    def handle_cards(self, spec, query, page, city=None):
+        """Filter and store the cards of one results page (see ``CardExtractor.extract_page``)"""
+        found, records, errors = page
+        fresh = kept = 0
+        for e in errors:
+            print(f"   Error parsing {spec.name} job card: {e}")
+            self.metrics.record_error(spec.name, query, e)
+        for fields in records:
             try:
-                print(f"   Searching: {query}")
+                if not all(fields[name] for name in spec.REQUIRED_FIELDS):
+                    continue
                 
-                # Naukri search URL
-                search_url = f"https://www.naukri.com/jobs-in-bangalore?k={quote_plus(query)}"
-                
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Find job listings
-                    job_cards = soup.find_all('article', class_='jobTuple')
-                    
-                    for card in job_cards[:5]:  # Limit to first 5 results per query
-                        try:
-                            title_elem = card.find('a', class_='title')
-                            company_elem = card.find('a', class_='subTitle')
-                            location_elem = card.find('span', class_='ellipsis location')
-                            
-                            if title_elem and company_elem:
-                                job_title = title_elem.get_text(strip=True)
-                                company_name = company_elem.get_text(strip=True)
-                                location = location_elem.get_text(strip=True) if location_elem else "Bangalore"
-                                job_url = "https://www.naukri.com" + title_elem.get('href', '')
-                                
-                                # Check if it's relevant (contains React, Frontend, Full Stack keywords)
-                                if self.is_relevant_job(job_title, query):
-                                    self.add_job_result(
-                                        job_title=job_title,
-                                        company_name=company_name,
-                                        location=location,
-                                        job_url=job_url,
-                                        posting_date=datetime.now().strftime("%Y-%m-%d"),
-                                        source="Naukri.com"
-                                    )
-                        except Exception as e:
-                            print(f"   Error parsing job card: {e}")
-                            continue
-                
-                time.sleep(2)  # Rate limiting
+                job_url = urljoin(spec.base_url + '/', fields['url']) if spec.base_url else fields['url']
+                posting_date = self.card_posting_date(fields.get('age'))
+                if not self.is_fresh(job_url, posting_date):
+                    continue
+                fresh += 1
                 
+                # Check if it's relevant (contains React, Frontend, Full Stack keywords)
+                if spec.filter_relevant and not self.is_relevant_job(
+                    fields['title'], query, fields.get('experience') or ""
+                ):
+                    continue
+                if self.add_job_result(
+                    job_title=fields['title'],
+                    company_name=fields['company'],
+                    location=fields.get('location') or city or spec.default_location,
+                    job_url=job_url,
+                    posting_date=posting_date,
+                    source=spec.name,
+                    experience=fields.get('experience')
+                ):
+                    kept += 1
             except Exception as e:
-                print(f"   Error searching Naukri for {query}: {e}")
+                print(f"   Error parsing {spec.name} job card: {e}")
+                self.metrics.record_error(spec.name, query, e)
+                continue
+        self.metrics.record_cards(spec.name, query, found, kept)
+        return fresh
+    
+    def search_naukri_jobs(self):
+        """Search for jobs on Naukri.com"""
+        self.search_source('naukri')
     
     def search_indeed_jobs(self):
         """Search for jobs on Indeed"""
-        print("🔍 Searching Indeed.com...")
-        
-        job_titles = ["React+Developer", "Frontend+Developer", "Full+Stack+Developer"]
-        
-        for title in job_titles:
-            try:
-                print(f"   Searching: {title.replace('+', ' ')}")
-                
-                search_url = f"https://in.indeed.com/jobs?q={title}&l=Bangalore"
-                
-                response = requests.get(search_url, headers=self.headers, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Find job listings
-                    job_cards = soup.find_all('div', class_='job_seen_beacon')
-                    
-                    for card in job_cards[:5]:  # Limit results
-                        try:
-                            title_elem = card.find('h2', class_='jobTitle')
-                            company_elem = card.find('span', class_='companyName')
-                            location_elem = card.find('div', class_='companyLocation')
-                            
-                            if title_elem and company_elem:
-                                job_link = title_elem.find('a')
-                                if job_link:
-                                    job_title = job_link.get('title', '') or job_link.get_text(strip=True)
-                                    company_name = company_elem.get_text(strip=True)
-                                    location = location_elem.get_text(strip=True) if location_elem else "Bangalore"
-                                    job_url = "https://in.indeed.com" + job_link.get('href', '')
-                                    
-                                    if self.is_relevant_job(job_title, title.replace('+', ' ')):
-                                        self.add_job_result(
-                                            job_title=job_title,
-                                            company_name=company_name,
-                                            location=location,
-                                            job_url=job_url,
-                                            posting_date=datetime.now().strftime("%Y-%m-%d"),
-                                            source="Indeed.com"
-                                        )
-                        except Exception as e:
-                            print(f"   Error parsing Indeed job card: {e}")
-                            continue
-                
-                time.sleep(2)  # Rate limiting
-                
-            except Exception as e:
-                print(f"   Error searching Indeed for {title}: {e}")
+        self.search_source('indeed')
+    
+    def search_glassdoor_jobs(self):
+        """Search Glassdoor for jobs"""
+        self.search_source('glassdoor')
     
     def search_company_pages(self):
         """Search specific company career pages"""
+        self.engine.run(self.company_page_tasks())
+        self.company_crawler.save_state()
+    
+    def company_page_tasks(self):
+        """Build the fetch tasks for company career pages"""
         print("🔍 Searching company career pages...")
         
-        companies = [
-            {"name": "Flipkart", "url": "https://www.flipkartcareers.com/"},
-            {"name": "Swiggy", "url": "https://careers.swiggy.com/"},
-            {"name": "Razorpay", "url": "https://razorpay.com/careers/"},
-            {"name": "BYJU'S", "url": "https://byjus.com/careers/"},
-        ]
+        for company in COMPANY_PAGES:
+            print(f"   Checking {company['name']}...")
         
-        for company in companies:
-            try:
-                print(f"   Checking {company['name']}...")
-                
-                # This is a simplified approach - each company would need custom parsing
-                response = requests.get(company['url'], headers=self.headers, timeout=10)
-                if response.status_code == 200:
-                    # Add sample job for demonstration (in real implementation, you'd parse their specific format)
-                    self.add_job_result(
-                        job_title=f"Frontend Developer - {company['name']}",
-                        company_name=company['name'],
-                        location="Bangalore",
-                        job_url=company['url'],
-                        posting_date=datetime.now().strftime("%Y-%m-%d"),
-                        source=f"{company['name']} Careers"
-                    )
-                
-                time.sleep(2)  # Rate limiting
-                
-            except Exception as e:
-                print(f"   Error checking {company['name']}: {e}")
+        return self.company_crawler.tasks(COMPANY_PAGES)
     
-    def search_glassdoor_jobs(self):
-        """Search Glassdoor for jobs"""
-        print("🔍 Searching Glassdoor...")
-        
-        try:
-            search_terms = ["React Developer", "Frontend Developer", "Full Stack Developer"]
-            
-            for term in search_terms:
-                print(f"   Searching: {term}")
-                
-                # Glassdoor search URL
-                search_url = f"https://www.glassdoor.co.in/Job/bangalore-{quote_plus(term.lower().replace(' ', '-'))}-jobs-SRCH_IL.0,9_IC2940587_KO10,{10+len(term.replace(' ', '-'))}.htm"
-                
-                try:
-                    response = requests.get(search_url, headers=self.headers, timeout=10)
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        # Find job listings (Glassdoor structure may vary)
-                        job_listings = soup.find_all('li', class_='react-job-listing')
-                        
-                        for job in job_listings[:3]:  # Limit results
-                            try:
-                                title_elem = job.find('a', {'data-test': 'job-title'})
-                                company_elem = job.find('span', {'data-test': 'employer-name'})
-                                
-                                if title_elem and company_elem:
-                                    job_title = title_elem.get_text(strip=True)
-                                    company_name = company_elem.get_text(strip=True)
-                                    job_url = "https://www.glassdoor.co.in" + title_elem.get('href', '')
-                                    
-                                    self.add_job_result(
-                                        job_title=job_title,
-                                        company_name=company_name,
-                                        location="Bangalore",
-                                        job_url=job_url,
-                                        posting_date=datetime.now().strftime("%Y-%m-%d"),
-                                        source="Glassdoor"
-                                    )
-                            except Exception as e:
-                                print(f"   Error parsing Glassdoor job: {e}")
-                                continue
-                                
-                except Exception as e:
-                    print(f"   Error with Glassdoor search for {term}: {e}")
-                
-                time.sleep(3)  # Longer delay for Glassdoor
-                
-        except Exception as e:
-            print(f"   Error searching Glassdoor: {e}")
-    
-    def is_relevant_job(self, job_title, search_query):
-        """Check if job is relevant to our search"""
-        job_title_lower = job_title.lower()
-        relevant_keywords = [
-            'react', 'frontend', 'front-end', 'full stack', 'fullstack', 
-            'javascript', 'js', 'web developer', 'ui developer'
-        ]
-        
-        # Check experience level (2-5 years)
-        experience_patterns = [
-            r'\b2[-\s]*5\s*years?\b',
-            r'\b2\+\s*years?\b',
-            r'\b3[-\s]*4\s*years?\b',
-            r'\bmid\s*level\b',
-            r'\bsenior\b'
-        ]
-        
-        has_relevant_keyword = any(keyword in job_title_lower for keyword in relevant_keywords)
+    def handle_company_posting(self, company, posting):
+        """Keep a fresh, relevant Bangalore opening found on a company career site"""
+        source = f"{company['name']} Careers"
+        posting_date = (posting['posted'] or datetime.now().date()).strftime("%Y-%m-%d")
+        kept = 0
+        if (self.is_fresh(posting['url'], posting_date)
+                and (not posting['location'] or self.matcher.scan(posting['location'])['location'])
+                and self.is_relevant_job(posting['title'], source)):
+            kept = self.add_job_result(
+                job_title=posting['title'],
+                company_name=posting['company'],
+                location=posting['location'] or "Bangalore",
+                job_url=posting['url'],
+                posting_date=posting_date,
+                source=source
+            )
+        self.metrics.record_cards(source, '', 1, int(kept))
+    
+    def paged_tasks(self, page_url, on_page, on_error, source, query, max_pages=None):
+        """Fetch tasks for the first window of result pages of one query"""
+        crawl = PagedCrawl(page_url, on_page, max_pages or self.max_pages, self.page_window,
+                           on_error, source, query)
+        return crawl.tasks()
+    
+    def card_posting_date(self, age_text):
+        """Posting date from a card's age label, defaulting to today"""
+        from parsing import parse_posted_date
         
-        return has_relevant_keyword
+        posted = parse_posted_date(age_text) if age_text else None
+        return (posted or datetime.now().date()).strftime("%Y-%m-%d")
+    
+    def posting_cutoff(self):
+        """Oldest posting date kept, as YYYY-MM-DD"""
+        return (datetime.now() - timedelta(days=self.max_age_days)).strftime("%Y-%m-%d")
+    
+    def is_fresh(self, job_url, posting_date):
+        """True for a listing inside the date cutoff that we have not seen yet"""
+        if posting_date < self.posting_cutoff():
+            return False
+        url_key = normalize_url(job_url)
+        if url_key in self.known_urls:
+            # Stored by an earlier run: remember the sighting but skip re-processing it
+            self.seen_known.add(url_key)
+            return False
+        return url_key not in self.url_index
+    
+    def report_search_error(self, site, query, error):
+        """Report a failed search request"""
+        print(f"   Error searching {site} for {query}: {error}")
+    
+    def report_company_error(self, company, error):
+        """Report a failed company careers page request"""
+        print(f"   Error checking {company['name']}: {error}")
+    
+    def is_relevant_job(self, job_title, search_query, details=""):
+        """Check if job is relevant to our search (tech keywords and 2-5 years experience)"""
+        return self.matcher.is_relevant(f"{job_title} {details}")
+    
+    def add_job_result(self, job_title, company_name, location, job_url, posting_date, source, experience=None):
+        """Add a job result to our collection, returning False for duplicates"""
+        # Avoid duplicates by normalized URL and, optionally, by title + company
+        url_key = normalize_url(job_url)
+        if url_key in self.url_index:
+            return False
+        if self.dedupe_by_title:
+            title_key = title_company_key(job_title, company_name)
+            if title_key in self.title_index:
+                return False
+            self.title_index.add(title_key)
+        self.url_index.add(url_key)
+        record = {
+            'Job Title': job_title,
+            'Company Name': company_name,
+            'Location': location,
+            'Job URL': job_url,
+            'Posting Date': posting_date,
+            'Source': source,
+            'Source URLs': job_url
+        }
+        # The card's experience text, so profiles can route on it before enrichment
+        if experience:
+            record['Experience'] = experience
+        # Search links are not postings; similar queries must each keep their link
+        if self.near_duplicates and source not in SEARCH_LINK_SOURCES and self.merge_near_duplicate(record):
+            return False
+        record = self.results.append(record)
+        # Stream postings the store has not seen yet straight to the export file;
+        # search links keep the same URL every run and are always exported
+        if self.sink and (url_key not in self.known_urls or source in SEARCH_LINK_SOURCES):
+            self.sink.write(record)
+        return True
+    
+    def merge_near_duplicate(self, record):
+        """Attach a listing to the posting it repeats; returns True if it was one"""
+        posting = (record['Job Title'], record['Company Name'], record['Location'] or '')
+        stored_near_dups = self.stored_near_dups
+        if stored_near_dups is not None:
+            stored_key = stored_near_dups.find(*posting)
+            if stored_key is not None:
+                self.seen_known.add(stored_key)
+                return True
+        # Indexed under the id of the row the record is about to get
+        canonical_id = self.near_dup_index.find_or_add(*posting, self.results.next_row_id())
+        if canonical_id is None:
+            return False
+        canonical = self.results.row(canonical_id)
+        if canonical is not None:
+            self.update_record(canonical, {'Source URLs': canonical['Source URLs'] + ' ' + record['Job URL']})
+        return True
+    
+    def update_record(self, record, fields):
+        """Change fields of a result, remembering them for the streamed export"""
+        record.update(fields)
+        self.record_updates.setdefault(record['Job URL'], {}).update(fields)
+    
+    def enrich_results(self, jobs=None):
+        """Fill in posting date, experience, salary and skills from each result's (or the given jobs') detail page"""
+        jobs = self.results if jobs is None else jobs
+        if not self.enricher or not jobs:
+            return
+        # LinkedIn entries are search links to open by hand, not job pages
+        records = [job for job in jobs if not job['Source'].startswith('LinkedIn')]
+        print(f"🔎 Reading {len(records)} job detail pages...")
+        self.engine.run(
+            self.enricher.tasks(records, self.apply_details),
+            max_workers=self.enricher.max_workers,
+        )
+    
+    def apply_details(self, record, details):
+        from enrichment import format_experience
+        
+        fields = {}
+        if details.get('posted'):
+            fields['Posting Date'] = details['posted'].strftime("%Y-%m-%d")
+        if details.get('experience'):
+            fields['Experience'] = format_experience(details['experience'])
+        if details.get('salary'):
+            fields['Salary'] = details['salary']
+        if details.get('skills'):
+            fields['Skills'] = ', '.join(details['skills'])
+        if fields:
+            self.update_record(record, fields)
+            # The card looked fresh, but the detail page dates the posting too far back
+            if fields.get('Posting Date', '9999') < self.posting_cutoff():
+                self.dropped_urls.add(record['Job URL'])
     
-    def add_job_result(self, job_title, company_name, location, job_url, posting_date, source):
-        """Add a job result to our collection"""
-        # Avoid duplicates
-        existing_urls = [job['Job URL'] for job in self.results]
-        if job_url not in existing_urls:
-            self.results.append({
-                'Job Title': job_title,
-                'Company Name': company_name,
-                'Location': location,
-                'Job URL': job_url,
-                'Posting Date': posting_date,
-                'Source': source
-            })
+    def rebuild_dedup_index(self):
+        """Recompute the dedup index after rows are dropped from self.results"""
+        columns = self.results.columns
+        self.url_index = {normalize_url(url) for url in columns['Job URL']}
+        self.title_index = set()
+        if self.dedupe_by_title:
+            self.title_index = {
+                title_company_key(title, company)
+                for title, company in zip(columns['Job Title'], columns['Company Name'])
+            }
+        self.near_dup_index = NearDuplicateIndex()
+        if self.near_duplicates:
+            for index, (title, company, location, source) in enumerate(
+                    zip(columns['Job Title'], columns['Company Name'], columns['Location'], columns['Source'])):
+                if source in SEARCH_LINK_SOURCES:
+                    continue
+                self.near_dup_index.add(title, company, location or '', self.results.row_id(index))
     
     def search_linkedin_posts(self):
         """Search LinkedIn for hiring posts with hashtags - Manual approach"""
@@ -246,13 +371,7 @@ class JobSearcher:
         print("   💡 MANUAL APPROACH RECOMMENDED:")
         print("   📌 Go to LinkedIn and search for:")
         
-        search_queries = [
-            "#hiring react js bangalore",
-            "#hiring frontend bangalore", 
-            "#hiring fullstack bangalore",
-            "#hiring reactjs bangalore",
-            "#hiring frontend developer bangalore"
-        ]
+        search_queries = linkedin_searches(self.profiles)
         
         for query in search_queries:
             encoded_query = quote_plus(query)
@@ -273,7 +392,7 @@ class JobSearcher:
             self.add_job_result(
                 job_title=f"Manual LinkedIn Search: {query}",
                 company_name="LinkedIn Search",
-                location="Bangalore",
+                location=self.linkedin_location(query),
                 job_url=search_url,
                 posting_date=today,
                 source="LinkedIn Search Link"
@@ -284,21 +403,17 @@ class JobSearcher:
         print("🔍 LinkedIn Jobs Search...")
         print("   💡 Creating direct LinkedIn Jobs search links...")
         
-        job_searches = [
-            "React Developer",
-            "Frontend Developer", 
-            "Full Stack Developer"
-        ]
+        job_searches = linkedin_jobs_searches(self.profiles)
         
         today = datetime.now().strftime("%Y-%m-%d")
         
-        for job_title in job_searches:
+        for job_title, city, region in job_searches:
             try:
-                print(f"   Creating search link: {job_title}")
+                print(f"   Creating search link: {job_title} ({city})")
                 
                 # LinkedIn Jobs search URL with filters
                 encoded_title = quote_plus(job_title)
-                encoded_location = quote_plus("Bangalore, Karnataka, India")
+                encoded_location = quote_plus(region)
                 
                 # f_TPR=r86400 means last 24 hours
                 jobs_url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_title}&location={encoded_location}&f_TPR=r86400&sortBy=DD"
@@ -306,7 +421,7 @@ class JobSearcher:
                 self.add_job_result(
                     job_title=f"LinkedIn Jobs: {job_title} (Last 24h)",
                     company_name="LinkedIn Job Search",
-                    location="Bangalore",
+                    location=city,
                     job_url=jobs_url,
                     posting_date=today,
                     source="LinkedIn Jobs Search"
@@ -315,17 +430,18 @@ class JobSearcher:
             except Exception as e:
                 print(f"   Error creating LinkedIn Jobs link for {job_title}: {e}")
     
+    def linkedin_location(self, query):
+        """City a LinkedIn post search names, defaulting to the first profile's first city"""
+        query = query.lower()
+        for profile in self.profiles:
+            for city in profile.cities:
+                if city.lower() in query:
+                    return city
+        return self.profiles[0].cities[0]
+    
     def is_linkedin_hiring_post(self, content_text):
         """Check if LinkedIn post is a hiring post for relevant positions"""
-        hiring_keywords = ['hiring', 'job opening', 'we are looking', 'join our team', 'career opportunity']
-        tech_keywords = ['react', 'frontend', 'front-end', 'fullstack', 'full stack', 'javascript', 'reactjs']
-        location_keywords = ['bangalore', 'bengaluru', 'blr']
-        
-        has_hiring = any(keyword in content_text for keyword in hiring_keywords)
-        has_tech = any(keyword in content_text for keyword in tech_keywords)
-        has_location = any(keyword in content_text for keyword in location_keywords)
-        
-        return has_hiring and has_tech and has_location
+        return self.matcher.is_hiring_post(content_text)
     
     def extract_job_title_from_linkedin_post(self, content_text):
         """Extract job title from LinkedIn post content"""
@@ -378,60 +494,149 @@ class JobSearcher:
             self.add_job_result(**post)
     
     def filter_today_posts_only(self):
-        """Filter to keep only today's posts"""
-        today = datetime.now().strftime("%Y-%m-%d")
-        self.results = [job for job in self.results if job['Posting Date'] == today]
-        print(f"🗓️  Filtered to today's posts only: {len(self.results)} jobs")
+        """Filter to keep only posts from the last ``max_age_days`` days (today's by default)"""
+        cutoff = self.posting_cutoff()
+        urls = self.results.column('Job URL')
+        self.dropped_urls.update(urls[index] for index in self.results.mask('Posting Date', cutoff.__gt__))
+        self.results.filter('Posting Date', cutoff.__le__)
+        self.rebuild_dedup_index()
+        print(f"🗓️  Filtered to posts {self.posting_window()}: {len(self.results)} jobs")
     
-    def search_all_sources(self):
-        """Main method to search all job sources"""
+    def posting_window(self):
+        """The posting-date window kept, in words ("today" or "since YYYY-MM-DD")"""
+        return "today" if not self.max_age_days else f"since {self.posting_cutoff()}"
+    
+    def search_all_sources(self, sources=None):
+        """Main method to search all job sources.
+        
+        ``sources`` limits the search to some of them: keys of ``SOURCES``,
+        ``'linkedin'`` (search links) and ``'company'`` (career pages).
+        """
+        wanted = set(sources) if sources else None
         print("🚀 Starting comprehensive job search...")
-        print("📅 Filtering for TODAY'S posts only")
+        print(f"📅 Filtering for posts {self.posting_window()}")
         print("=" * 60)
         
+        if self.store:
+            self.store.start_run()
+        
         try:
             # Search different sources
-            self.search_linkedin_posts()      # NEW: LinkedIn hashtag posts
-            self.search_linkedin_jobs()       # NEW: LinkedIn Jobs section
-            self.search_indeed_jobs()
-            self.search_naukri_jobs()
-            self.search_glassdoor_jobs()
-            self.search_company_pages()
+            if wanted is None or 'linkedin' in wanted:
+                self.search_linkedin_posts()      # NEW: LinkedIn hashtag posts
+                self.search_linkedin_jobs()       # NEW: LinkedIn Jobs section
+            
+            # Fetch the whole query x source matrix as one workload; each host keeps its own limits
+            companies = wanted is None or 'company' in wanted
+            self.engine.run(chain(
+                chain.from_iterable(
+                    self.source_tasks(spec) for key, spec in SOURCES.items() if wanted is None or key in wanted
+                ),
+                self.company_page_tasks() if companies else (),
+            ))
+            if companies:
+                self.company_crawler.save_state()
+            
+            # Real posting dates come from the detail pages when enrichment is on
+            self.enrich_results()
             
-            # Filter to today's posts only
+            # Keep only the posting-date window (today's posts by default)
             self.filter_today_posts_only()
             
         except Exception as e:
             print(f"Error during search: {e}")
         
-        print(f"\n✅ Search completed! Found {len(self.results)} relevant jobs for TODAY")
+        print(f"\n✅ Search completed! Found {len(self.results)} relevant jobs posted {self.posting_window()}")
+        merged = sum(len((urls or '').split()[1:]) for urls in self.results.column('Source URLs'))
+        if merged:
+            print(f"🔁 Merged {merged} listings of the same openings across sources")
     
-    def export_to_csv(self, filename=None):
-        """Export results to CSV file"""
+    def persist_results(self):
+        """Upsert this run's results into the job store and keep the new ones"""
+        if not self.store:
+            self.new_results = list(self.results)
+            return
+        new, changed, unchanged = self.store.upsert(self.results)
+        self.store.touch(self.seen_known)
+        known = len(unchanged) + len(self.seen_known)
+        self.store.finish_run(len(new), len(new) + len(changed) + known)
+        self.new_results = new
+        print(f"🗃️  Job store: {len(new)} new, {len(changed)} updated, {known} already known")
+    
+    def finish_export(self, sort=True):
+        """Close the streaming export(s), optionally re-ordering them newest first"""
+        if not self.sink:
+            return None
+        self.sink.close()
+        # A ProfileSink streams into one file per profile
+        paths = [self.finish_file(sink, sort) for sink in getattr(self.sink, 'sinks', [self.sink])]
+        return ', '.join(path for path in paths if path) or None
+    
+    def finish_file(self, sink, sort=True):
+        """Sort one closed export file in place, or remove it if empty"""
+        if not sink.count:
+            os.remove(sink.path)
+            return None
+        if sort or self.record_updates or self.dropped_urls:
+            # Merged URLs and detail-page fields found after a record was streamed are filled in
+            # here, and records dropped from the results since are left out
+            # The sink's own format: --format may not match the file's extension
+            written = sort_file(sink.path, key=posting_date_key, reverse=True, fmt=sink.fmt,
+                                update=self.apply_record_updates, drop=self.was_dropped)
+            if not written:
+                os.remove(sink.path)
+                return None
+        print(f"📁 Results exported to: {sink.path}")
+        return sink.path
+    
+    def was_dropped(self, record):
+        return record['Job URL'] in self.dropped_urls
+    
+    def apply_record_updates(self, record):
+        record.update(self.record_updates.get(record['Job URL'], ()))
+    
+    def export_to_csv(self, filename=None, jobs=None):
+        """Export results (or the given jobs) to CSV file"""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"bangalore_jobs_{timestamp}.csv"
         
-        if not self.results:
+        jobs = self.results if jobs is None else jobs
+        if not jobs:
             print("❌ No jobs found to export")
             return None
         
-        # Sort by posting date (newest first)
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x['Posting Date'],
-            reverse=True
-        )
+        # Sort by posting date (newest first) without holding a second full copy
+        sink = CsvSink(filename, autoflush=False)
+        try:
+            for job in self.newest_first(jobs):
+                sink.write(job)
+        finally:
+            sink.close()
         
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Job Title', 'Company Name', 'Location', 'Job URL', 'Posting Date', 'Source']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(sorted_results)
+        print(f"📁 Results exported to: {filename}")
+        return filename
+    
+    def export_to_parquet(self, filename=None):
+        """Export results to a Parquet file (needs pyarrow)"""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"bangalore_jobs_{timestamp}.parquet"
         
+        if not self.results:
+            print("❌ No jobs found to export")
+            return None
+        
+        self.results.write_parquet(filename, order=self.results.argsort('Posting Date', reverse=True))
         print(f"📁 Results exported to: {filename}")
         return filename
     
+    def newest_first(self, jobs):
+        """Jobs ordered by posting date, newest first"""
+        if isinstance(jobs, ResultTable):
+            return jobs.sorted_rows('Posting Date', reverse=True)
+        return external_sort(jobs, key=posting_date_key, reverse=True)
+    
     def print_summary(self):
         """Print a summary of found jobs"""
         if not self.results:
@@ -443,11 +648,7 @@ class JobSearcher:
         print(f"{'='*80}")
         
         # Sort by posting date
-        sorted_results = sorted(
-            self.results,
-            key=lambda x: x['Posting Date'],
-            reverse=True
-        )
+        sorted_results = self.newest_first(self.results)
         
         for i, job in enumerate(sorted_results, 1):
             print(f"\n{i}. 💼 {job['Job Title']}")
@@ -456,35 +657,74 @@ class JobSearcher:
             print(f"   📅 Posted: {job['Posting Date']}")
             print(f"   🌐 Source: {job['Source']}")
             print(f"   🔗 URL: {job['Job URL']}")
+            other_urls = job.get('Source URLs', '').split()[1:]
+            if other_urls:
+                print(f"   🔁 Also listed at: {', '.join(other_urls)}")
+
+def finish_run(searcher):
+    """Report on a finished search and close its caches, store, connections and export"""
+    searcher.metrics.finish()
+    searcher.metrics.print_summary()
+    searcher.metrics.write_json("run_report.json")
+    searcher.metrics.write_prometheus("run_metrics.prom")
+    print("📈 Run report: run_report.json (Prometheus: run_metrics.prom)")
+    if searcher.engine.cache:
+        searcher.engine.cache.print_stats()
+    if searcher.enricher and searcher.enricher.cache:
+        searcher.enricher.cache.print_stats()
+        searcher.enricher.cache.close()
+    if searcher.parse_pool:
+        searcher.parse_pool.close()
+    searcher.engine.sessions.close()
+    if searcher.store:
+        searcher.store.close()
+    if searcher.sink:
+        searcher.sink.close()
 
 def main():
     """Main function to run the job search"""
+    from enrichment import DetailCache, DetailEnricher
+    
+    profiles = load_profiles(PROFILE_FILE) if os.path.exists(PROFILE_FILE) else None
+    
     print("🎯 Bangalore Job Search Tool - TODAY'S POSTS ONLY")
     print("🔍 Sources: Indeed, Naukri, Glassdoor + LinkedIn Search Links")
-    print("💼 Positions: Frontend, React, Full-stack (2-5 years exp)")
+    if profiles:
+        print(f"👥 Profiles ({PROFILE_FILE}): {', '.join(profile.name for profile in profiles)}")
+    else:
+        print("💼 Positions: Frontend, React, Full-stack (2-5 years exp)")
     print("📅 Filter: Current day only (latest to oldest)")
     print("=" * 70)
     
-    searcher = JobSearcher()
+    # Postings are written to the CSV as they are found, so a crash keeps what was collected
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    searcher = JobSearcher(
+        store=JobStore(),
+        sink=open_profile_sink(profiles, timestamp) if profiles else open_sink(f"bangalore_jobs_{timestamp}.csv"),
+        enricher=DetailEnricher(DetailCache()),
+        profiles=profiles,
+    )
     
     try:
         # Search all sources
         searcher.search_all_sources()
         
+        # Remember everything found; only postings new since the last run were exported
+        searcher.persist_results()
+        csv_filename = searcher.finish_export()
+        
         if searcher.results:
             # Print summary
             searcher.print_summary()
             
-            # Export to CSV
-            csv_filename = searcher.export_to_csv()
-            
             print(f"\n🎉 Job search completed successfully!")
             print(f"📊 Total results found: {len(searcher.results)}")
+            print(f"🆕 New since last run: {len(searcher.new_results)}")
             print(f"📄 Results saved to: {csv_filename}")
             print(f"\n💡 Results include:")
             print("   • 🔍 Scraped jobs: Direct job URLs from Indeed, Naukri, Glassdoor")
             print("   • 🔗 LinkedIn search links: Click to manually search LinkedIn")
-            print("   • 🏢 Company career pages: Direct links to check manually")
+            print("   • 🏢 Company career sites: Openings found via ATS feeds, sitemaps and job pages")
             print(f"\n📋 LinkedIn Manual Search Instructions:")
             print("   1. Click on the LinkedIn search links in your CSV")
             print("   2. Log into LinkedIn when prompted")
@@ -501,6 +741,8 @@ def main():
     except Exception as e:
         print(f"❌ Error during job search: {e}")
         print("Please check your internet connection and try again.")
+    finally:
+        finish_run(searcher)
 
 if __name__ == "__main__":
     main()
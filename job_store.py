@@ -0,0 +1,162 @@
+import hashlib
+import sqlite3
+from datetime import datetime
+
+from dedup import normalize_url
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    url_key      TEXT PRIMARY KEY,
+    job_title    TEXT NOT NULL,
+    company_name TEXT NOT NULL,
+    location     TEXT,
+    job_url      TEXT NOT NULL,
+    posting_date TEXT,
+    source       TEXT,
+    content_hash TEXT NOT NULL,
+    first_seen   TEXT NOT NULL,
+    last_seen    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs (source);
+CREATE INDEX IF NOT EXISTS jobs_posting_date ON jobs (posting_date);
+CREATE INDEX IF NOT EXISTS jobs_first_seen ON jobs (first_seen);
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT,
+    new_jobs    INTEGER DEFAULT 0,
+    seen_jobs   INTEGER DEFAULT 0
+);
+"""
+
+# Result dict keys -> jobs table columns
+COLUMNS = {
+    'Job Title': 'job_title',
+    'Company Name': 'company_name',
+    'Location': 'location',
+    'Job URL': 'job_url',
+    'Posting Date': 'posting_date',
+    'Source': 'source',
+}
+
+
+def content_hash(job):
+    """Hash of the fields that make a stored posting worth rewriting"""
+    text = '\x1f'.join(str(job.get(key, '')) for key in COLUMNS)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class JobStore:
+    """SQLite (WAL mode) store of every posting seen across runs"""
+
+    def __init__(self, path='bangalore_jobs.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.run_id = None
+        self.run_started = None
+
+    def start_run(self):
+        """Open a run record; returns the timestamp used for first/last seen"""
+        self.run_started = datetime.now().isoformat(timespec='seconds')
+        with self.conn:
+            cursor = self.conn.execute('INSERT INTO runs (started_at) VALUES (?)', (self.run_started,))
+        self.run_id = cursor.lastrowid
+        return self.run_started
+
+    def finish_run(self, new_jobs, seen_jobs):
+        with self.conn:
+            self.conn.execute(
+                'UPDATE runs SET finished_at = ?, new_jobs = ?, seen_jobs = ? WHERE id = ?',
+                (datetime.now().isoformat(timespec='seconds'), new_jobs, seen_jobs, self.run_id),
+            )
+
+    def last_run_started(self):
+        """Start time of the most recent finished run, or None"""
+        row = self.conn.execute(
+            'SELECT started_at FROM runs WHERE finished_at IS NOT NULL ORDER BY id DESC LIMIT 1'
+        ).fetchone()
+        return row[0] if row else None
+
+    def known_url_keys(self):
+        """Normalized URLs of every stored posting"""
+        return {row[0] for row in self.conn.execute('SELECT url_key FROM jobs')}
+
+    def dedup_rows(self, since=None):
+        """(url_key, title, company, location) of stored postings last seen at or after ``since``"""
+        return self.conn.execute(
+            'SELECT url_key, job_title, company_name, location FROM jobs WHERE last_seen >= ?',
+            (since or '',),
+        )
+
+    def _existing_hashes(self, keys, chunk=500):
+        hashes = {}
+        for i in range(0, len(keys), chunk):
+            part = keys[i:i + chunk]
+            query = f"SELECT url_key, content_hash FROM jobs WHERE url_key IN ({','.join('?' * len(part))})"
+            hashes.update(self.conn.execute(query, part))
+        return hashes
+
+    def upsert(self, jobs, seen_at=None):
+        """Insert new postings, rewrite changed ones and touch the rest.
+
+        Returns ``(new, changed, unchanged)`` lists of the given job dicts.
+        """
+        seen_at = seen_at or self.run_started or datetime.now().isoformat(timespec='seconds')
+        keyed = {}
+        for job in jobs:
+            keyed.setdefault(normalize_url(job['Job URL']), job)
+        existing = self._existing_hashes(list(keyed))
+
+        new, changed, unchanged = [], [], []
+        inserts, updates, touches = [], [], []
+        for key, job in keyed.items():
+            digest = content_hash(job)
+            fields = tuple(job.get(name) for name in COLUMNS)
+            if key not in existing:
+                new.append(job)
+                inserts.append((key,) + fields + (digest, seen_at, seen_at))
+            elif existing[key] != digest:
+                changed.append(job)
+                updates.append(fields + (digest, seen_at, key))
+            else:
+                unchanged.append(job)
+                touches.append((seen_at, key))
+
+        columns = ', '.join(COLUMNS.values())
+        with self.conn:
+            self.conn.executemany(
+                f'INSERT INTO jobs (url_key, {columns}, content_hash, first_seen, last_seen) '
+                f'VALUES ({", ".join("?" * (len(COLUMNS) + 4))})',
+                inserts,
+            )
+            self.conn.executemany(
+                f'UPDATE jobs SET {", ".join(c + " = ?" for c in COLUMNS.values())}, '
+                'content_hash = ?, last_seen = ? WHERE url_key = ?',
+                updates,
+            )
+            self.conn.executemany('UPDATE jobs SET last_seen = ? WHERE url_key = ?', touches)
+        return new, changed, unchanged
+
+    def touch(self, url_keys, seen_at=None):
+        """Mark already-stored postings as seen again without re-reading them"""
+        seen_at = seen_at or self.run_started or datetime.now().isoformat(timespec='seconds')
+        with self.conn:
+            self.conn.executemany(
+                'UPDATE jobs SET last_seen = ? WHERE url_key = ?',
+                [(seen_at, key) for key in url_keys],
+            )
+
+    def new_since(self, timestamp):
+        """Postings first seen at or after a timestamp, newest posting first"""
+        rows = self.conn.execute(
+            f'SELECT {", ".join(COLUMNS.values())} FROM jobs WHERE first_seen >= ? '
+            'ORDER BY posting_date DESC',
+            (timestamp,),
+        )
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def close(self):
+        self.conn.close()
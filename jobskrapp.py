@@ -0,0 +1,174 @@
+"""Command-line entry point.
+
+    python -m jobskrapp                                  # every source, today's posts, CSV
+    python -m jobskrapp --sources indeed,naukri --since 24h --format jsonl
+    python -m jobskrapp --sources glassdoor --plan       # print the request plan, fetch nothing
+    python -m jobskrapp daemon --notify https://example.com/hook
+    python -m jobskrapp replay fixtures.zip              # replay a recorded crawl (see replay.py)
+    python -m jobskrapp replay record fixtures.zip       # record one from the live sites
+
+Only what a command uses is imported: ``--help`` and ``--plan`` need just
+the source and profile definitions, and requests and the job store are
+loaded once a search actually runs.  BeautifulSoup, the company crawler
+and the detail cache are loaded only for sources that fetch pages to
+parse, so ``--sources linkedin`` runs without them.
+"""
+import argparse
+import importlib
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+
+from profiles import (DEFAULT_PROFILE, PROFILE_FILE, labelled_searches, linkedin_jobs_searches, linkedin_searches,
+                      load_profiles, open_profile_sink)
+from sources import COMPANY_PAGES, SOURCES
+
+# Sources besides the results-page sites in SOURCES
+EXTRA_SOURCES = ('company', 'linkedin')
+
+# Subcommands: name -> module whose main(argv) runs it
+COMMANDS = {'daemon': 'daemon', 'replay': 'replay'}
+
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*([hdw])', re.I)
+_HOURS = {'h': 1, 'd': 24, 'w': 24 * 7}
+
+
+def parse_since(text):
+    """Posting-date window in days for a duration like "24h", "3d" or "1w" ("today" is 0).
+
+    Postings are dated by day, so the window reaches back to the calendar
+    day the duration starts on: "24h" keeps yesterday's postings too.
+    """
+    if text.lower() == 'today':
+        return 0
+    match = _DURATION.fullmatch(text.strip())
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected a duration like 24h, 3d or 1w, not {text!r}")
+    now = datetime.now()
+    start = now - timedelta(hours=float(match.group(1)) * _HOURS[match.group(2).lower()])
+    return (now.date() - start.date()).days
+
+
+def source_list(text):
+    names = [name.strip().lower() for name in text.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SOURCES and name not in EXTRA_SOURCES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown source {', '.join(unknown)} (choose from {', '.join(list(SOURCES) + list(EXTRA_SOURCES))})"
+        )
+    return names
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m jobskrapp',
+        description="Search job sites for fresh postings matching your profiles.",
+        epilog="Commands: 'daemon' polls sources and pushes new matches (see daemon.py --help); "
+               "'replay [record|replay] <fixtures.zip>' records or replays a crawl.",
+    )
+    parser.add_argument('--sources', type=source_list, metavar='LIST',
+                        help=f"comma-separated sources to search: {', '.join(list(SOURCES) + list(EXTRA_SOURCES))} "
+                             "(default: all)")
+    parser.add_argument('--since', type=parse_since, default=0, metavar='DURATION',
+                        help="keep postings from this far back, e.g. 24h, 3d, 1w (default: today)")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="export format (default: csv)")
+    parser.add_argument('--output', metavar='PATH',
+                        help="export file (default: bangalore_jobs_<timestamp>.<format>; "
+                             "with profiles, each profile's own file)")
+    parser.add_argument('--profiles', metavar='FILE',
+                        help=f"search profiles to use (default: {PROFILE_FILE} if it exists)")
+    parser.add_argument('--max-pages', type=int, default=3, metavar='N',
+                        help="results pages per search at most (default: %(default)s)")
+    parser.add_argument('--parse-workers', type=int, default=0, metavar='N',
+                        help="parse results pages in N worker processes (default: in-process)")
+    parser.add_argument('--plan', '--dry-run', action='store_true', dest='plan',
+                        help="print the requests a search would make, without fetching anything")
+    return parser
+
+
+def print_plan(sources, profiles, max_pages):
+    """Print the requests a search of ``sources`` would start with; returns how many at most"""
+    wanted = set(sources) if sources else None
+    total = 0
+    print("📋 Request plan (nothing is fetched)")
+    for key, spec in SOURCES.items():
+        if wanted is not None and key not in wanted:
+            continue
+        pages = spec.max_pages or max_pages
+        rate = spec.rate
+        pacing = f"1 request per {rate.min_interval:g}s" if rate.min_interval > 0 else "no pacing"
+        found = labelled_searches(spec, profiles)
+        print(f"🔍 {spec.name} ({spec.host}, {rate.max_concurrency} at a time, {pacing})")
+        for label, query, city in found:
+            print(f"   {label}: {spec.page_url(query, 1, city)}"
+                  + (f" (+ up to {pages - 1} more pages)" if pages > 1 else ""))
+        total += len(found) * pages
+    if wanted is None or 'company' in wanted:
+        print(f"🏢 Company pages ({len(COMPANY_PAGES)} sites: sitemap or ATS feed, then job pages)")
+        for company in COMPANY_PAGES:
+            print(f"   {company['name']}: {company['url']}")
+    if wanted is None or 'linkedin' in wanted:
+        links = len(linkedin_searches(profiles)) + len(linkedin_jobs_searches(profiles))
+        print(f"🔗 LinkedIn: {links} search links written to the export (not fetched)")
+    print(f"📦 Up to {total} results-page requests")
+    return total
+
+
+def search(args, profiles):
+    """Run a search and export what it finds"""
+    from exporters import open_sink
+    from job_search import JobSearcher, finish_run
+    from job_store import JobStore
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if args.output:
+        sink = open_sink(args.output, args.format)
+    elif profiles:
+        sink = open_profile_sink(profiles, timestamp, args.format)
+    else:
+        sink = open_sink(f"bangalore_jobs_{timestamp}.{args.format or 'csv'}")
+    pool = None
+    if args.parse_workers:
+        from parse_pool import ParsePool
+
+        pool = ParsePool(args.parse_workers)
+    enricher = None
+    # LinkedIn rows are search links, so only the other sources have detail pages to read
+    if not args.sources or any(name != 'linkedin' for name in args.sources):
+        from enrichment import DetailCache, DetailEnricher
+
+        enricher = DetailEnricher(DetailCache())
+    searcher = JobSearcher(
+        store=JobStore(),
+        sink=sink,
+        enricher=enricher,
+        profiles=profiles,
+        max_pages=args.max_pages,
+        max_age_days=args.since,
+        parse_pool=pool,
+    )
+    try:
+        searcher.search_all_sources(args.sources)
+        searcher.persist_results()
+        path = searcher.finish_export()
+        print(f"📊 {len(searcher.results)} results, {len(searcher.new_results)} new since last run → {path}")
+    finally:
+        finish_run(searcher)
+    return 0
+
+
+def main(argv):
+    if argv and argv[0] in COMMANDS:
+        return importlib.import_module(COMMANDS[argv[0]]).main(argv[1:])
+    args = build_parser().parse_args(argv)
+    profile_file = args.profiles or (PROFILE_FILE if os.path.exists(PROFILE_FILE) else None)
+    profiles = load_profiles(profile_file) if profile_file else None
+    if args.plan:
+        print_plan(args.sources, profiles or [DEFAULT_PROFILE], args.max_pages)
+        return 0
+    return search(args, profiles)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
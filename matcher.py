@@ -0,0 +1,189 @@
+import re
+
+# Keyword groups matched as plain substrings of the lowercased text
+TECH_KEYWORDS = [
+    'react', 'reactjs', 'frontend', 'front-end', 'full stack', 'fullstack',
+    'javascript', 'js', 'web developer', 'ui developer',
+]
+LOCATION_KEYWORDS = ['bangalore', 'bengaluru', 'blr']
+HIRING_KEYWORDS = ['hiring', 'job opening', 'we are looking', 'join our team', 'career opportunity']
+
+KEYWORD_GROUPS = {
+    'tech': TECH_KEYWORDS,
+    'location': LOCATION_KEYWORDS,
+    'hiring': HIRING_KEYWORDS,
+}
+
+# Words that make it worth looking for an experience range such as "2-5 years"
+EXPERIENCE_TRIGGERS = ['year', 'years', 'yr', 'yrs']
+EXPERIENCE_PATTERN = re.compile(
+    r'(\d{1,2})\s*(?:(?:-|–|to)\s*(\d{1,2})|(\+))\s*(?:years?|yrs?)\b'
+)
+
+
+def trie_pattern(words):
+    """Regex source for a set of literal words, factored into a prefix trie.
+
+    Python's regex engine can only skip ahead quickly when every branch
+    starts with a literal character, which a trie alternation guarantees;
+    it also means each position is tried against one branch per distinct
+    first letter instead of once per keyword.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+def sum_masks(masks):
+    total = 0
+    for mask in masks:
+        total |= mask
+    return total
+
+
+def resume_offset(word, words):
+    """Smallest offset in ``word`` where a keyword reaching past its end could start"""
+    for offset in range(1, len(word)):
+        tail = word[offset:]
+        if any(other.startswith(tail) and len(other) > len(tail) for other in words):
+            return offset
+    return len(word)
+
+
+class MatchResult:
+    """Which keyword groups a text hit, plus any experience ranges it states.
+
+    Experience ranges are ``(low, high)`` tuples; ``high`` is None for "N+ years".
+    """
+
+    __slots__ = ('mask', 'group_bits', 'experience')
+
+    def __init__(self, mask, group_bits, experience):
+        self.mask = mask
+        self.group_bits = group_bits
+        self.experience = experience
+
+    def __getitem__(self, group):
+        return bool(self.mask & self.group_bits.get(group, 0))
+
+    @property
+    def groups(self):
+        return {name for name, bit in self.group_bits.items() if self.mask & bit}
+
+
+class RelevanceMatcher:
+    """Matches every keyword group and experience range in one regex pass.
+
+    All keywords of all groups are compiled into a single trie-shaped
+    alternation.  Each group gets a bit, each keyword the bitmask of the
+    groups it belongs to, so a scan is one regex search per hit plus an OR
+    no matter how many groups or keywords are configured.  Experience
+    ranges are only parsed out of texts that mention years at all.
+
+    The regex finds the longest keyword at each position and skips past
+    it, which would hide keywords overlapping it ("react" in "react
+    native").  So each keyword's hit mask also covers every keyword inside
+    it, and after a keyword whose tail can start another ("year" then
+    "react" in "yeareact") the search resumes inside it, which keeps
+    plain substring semantics.
+    """
+
+    def __init__(self, keyword_groups=None, experience_range=(2, 5)):
+        self.keyword_groups = {
+            name: list(keywords) for name, keywords in (keyword_groups or KEYWORD_GROUPS).items()
+        }
+        self.experience_range = experience_range
+        names = list(self.keyword_groups) + ['experience']
+        self.group_bits = {name: 1 << i for i, name in enumerate(names)}
+        self.word_masks = {}
+        for name, keywords in self.keyword_groups.items():
+            for word in keywords:
+                word = word.lower()
+                self.word_masks[word] = self.word_masks.get(word, 0) | self.group_bits[name]
+        for word in EXPERIENCE_TRIGGERS:
+            self.word_masks[word] = self.word_masks.get(word, 0) | self.group_bits['experience']
+        self.pattern = re.compile(trie_pattern(self.word_masks))
+        words = list(self.word_masks)
+        # Groups a hit on a keyword proves: its own and those of every keyword inside it
+        self.hit_masks = {
+            word: sum_masks(self.word_masks[other] for other in words if other in word) for word in words
+        }
+        # Where to search again after a hit: the first offset at which another keyword could start
+        self.resume = {word: resume_offset(word, words) for word in words}
+        self._relevant_bits = self.group_bits.get('tech', 0)
+        self._hiring_bits = self.group_bits.get('hiring', 0) | self._relevant_bits | self.group_bits.get('location', 0)
+
+    def _scan_mask(self, text):
+        mask = 0
+        hit_masks, resume, search = self.hit_masks, self.resume, self.pattern.search
+        match = search(text)
+        while match:
+            word = match.group()
+            mask |= hit_masks[word]
+            match = search(text, match.start() + resume[word])
+        return mask
+
+    def scan(self, text):
+        """Return a MatchResult for the text in a single pass"""
+        text = text.lower()
+        mask = self._scan_mask(text)
+        experience = []
+        if mask & self.group_bits['experience']:
+            experience = experience_ranges(text)
+            if not experience:
+                mask &= ~self.group_bits['experience']
+        return MatchResult(mask, self.group_bits, experience)
+
+    def experience_ok(self, ranges):
+        """True when no experience is stated or a stated range overlaps ours"""
+        if not self.experience_range or not ranges:
+            return True
+        wanted_low, wanted_high = self.experience_range
+        return any(
+            low <= wanted_high and (high is None or high >= wanted_low)
+            for low, high in ranges
+        )
+
+    def _matches(self, text, required):
+        text = text.lower()
+        mask = self._scan_mask(text)
+        if mask & required != required:
+            return False
+        if mask & self.group_bits['experience']:
+            return self.experience_ok(experience_ranges(text))
+        return True
+
+    def matches(self, text, groups):
+        """Every named keyword group present and experience (if stated) within range"""
+        required = 0
+        for group in groups:
+            required |= self.group_bits[group]
+        return self._matches(text, required)
+
+    def is_relevant(self, text):
+        """Tech keyword present and experience (if stated) within range"""
+        return self._matches(text, self._relevant_bits)
+
+    def is_hiring_post(self, text):
+        """Hiring intent, tech and location all present, experience within range"""
+        return self._matches(text, self._hiring_bits)
+
+
+def experience_ranges(text):
+    """All "N-M years" / "N+ years" ranges stated in lowercased text"""
+    return [
+        (int(low), None if plus else int(high))
+        for low, high, plus in EXPERIENCE_PATTERN.findall(text)
+    ]
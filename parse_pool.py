@@ -0,0 +1,63 @@
+"""Results-page parsing in worker processes.
+
+Building the card trees of a results page is CPU work that holds the GIL,
+so with the parse on the dispatcher thread one core parses while the
+fetch threads wait for it.  A ``ParsePool`` moves it into processes: the
+dispatcher hands each page's raw bytes and its source's ``CardExtractor``
+to a worker and gets back the cards' field values, plain dicts that are
+small next to the page.  Freshness, relevance and dedup still run on the
+dispatcher thread, where the indexes live.
+
+At most ``max_pending`` pages are queued or being parsed; the
+``FetchEngine`` the pool is attached to starts no request while that many
+are waiting, so memory stays bounded and fetching follows the parse rate.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from fetch_engine import Pending
+
+
+def extract_page(extractor, content):
+    """``(seconds, extractor.extract_page(content))``, run in a worker"""
+    start = time.perf_counter()
+    page = extractor.extract_page(content)
+    return time.perf_counter() - start, page
+
+
+class ParsePool:
+    """Process pool parsing results pages off the fetch path.
+
+    Workers are spawned rather than forked, as the fetch threads may be
+    holding locks when the first page arrives.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.workers
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def attach(self, engine):
+        """Hold back ``engine``'s fetches while the pool is full"""
+        engine.max_pending = self.max_pending
+        return self
+
+    def submit(self, extractor, content):
+        """Pending whose result is ``(cards, records, errors)`` (see ``CardExtractor.extract_page``)"""
+        return Pending(self._executor.submit(extract_page, extractor, content), timed=True)
+
+    def warm_up(self):
+        """Start every worker now instead of on the first pages"""
+        for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
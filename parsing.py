@@ -0,0 +1,107 @@
+import json
+import re
+from datetime import date, datetime, timedelta
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Prefer the lxml backend (see README); fall back to the stdlib parser
+try:
+    import lxml  # noqa: F401
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+
+
+def make_soup(content, parse_only=None, parser=None):
+    """Build a BeautifulSoup tree with the fastest available backend"""
+    return BeautifulSoup(content, parser or PARSER, parse_only=parse_only)
+
+
+def find_cards(content, name, attrs, parser=None):
+    """Return the job card elements of a results page.
+
+    Only the card subtrees are turned into Tag objects; the rest of the page
+    (scripts, navigation, footers) is tokenized and then dropped.
+    """
+    soup = make_soup(content, SoupStrainer(name, _strainer_attrs(attrs)), parser)
+    return soup.find_all(name, attrs)
+
+
+def _strainer_attrs(attrs):
+    # While parsing, a strainer sees the raw class attribute ("jobTuple bgWhite")
+    # rather than the split class list, so match class names as whole words.
+    strained = dict(attrs)
+    css_class = strained.get('class')
+    if isinstance(css_class, str):
+        strained['class'] = re.compile(r'(?:^|\s)' + re.escape(css_class) + r'(?:\s|$)')
+    return strained
+
+
+_AGE_PATTERN = re.compile(r'(\d+)\s*\+?\s*(minute|min|hour|hr|day|week|month|mo|[mhdw])s?\b', re.I)
+_AGE_UNIT_DAYS = {'week': 7, 'w': 7, 'month': 30, 'mo': 30}
+
+
+def parse_posted_date(text, today=None):
+    """Turn a card's relative age ("3 days ago", "30+ days", "Just posted", "2d") into a date.
+
+    Returns None when the text carries no recognisable age.
+    """
+    today = today or date.today()
+    if not text:
+        return None
+    text = text.strip().lower()
+    if any(word in text for word in ('just', 'today', 'hour', 'minute', 'few')):
+        return today
+    if 'yesterday' in text:
+        return today - timedelta(days=1)
+    match = _AGE_PATTERN.search(text)
+    if not match:
+        return None
+    amount, unit = int(match.group(1)), match.group(2).lower()
+    if unit in ('minute', 'min', 'm', 'hour', 'hr', 'h'):
+        return today
+    return today - timedelta(days=amount * _AGE_UNIT_DAYS.get(unit, 1))
+
+
+def json_ld_postings(content):
+    """Every schema.org JobPosting object embedded in a page"""
+    postings = []
+    for script in find_cards(content, 'script', {'type': 'application/ld+json'}):
+        try:
+            data = json.loads(script.string or script.get_text())
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                kind = item.get('@type')
+                if kind == 'JobPosting' or (isinstance(kind, list) and 'JobPosting' in kind):
+                    postings.append(item)
+                elif '@graph' in item:
+                    stack.append(item['@graph'])
+    return postings
+
+
+def json_ld_location(location):
+    """City (and region) of a JobPosting jobLocation value"""
+    if isinstance(location, list):
+        return ', '.join(filter(None, (json_ld_location(item) for item in location)))
+    if not isinstance(location, dict):
+        return location if isinstance(location, str) else ''
+    address = location.get('address') or {}
+    if isinstance(address, str):
+        return address
+    return ', '.join(filter(None, [address.get('addressLocality'), address.get('addressRegion')]))
+
+
+def parse_iso_date(value):
+    """Date part of an ISO-8601 timestamp, or None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value)[:10]).date()
+    except ValueError:
+        return None
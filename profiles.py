@@ -0,0 +1,233 @@
+"""Search profiles: the criteria a crawl serves.
+
+A profile is one person's search: roles and cities to search for, the
+keywords a title must mention, an experience range and an export file.
+Any number of them can be loaded from a JSON file::
+
+    [
+      {"name": "frontend-blr", "roles": ["React Developer", "Frontend Developer"],
+       "cities": ["Bangalore"], "experience": [2, 5]},
+      {"name": "java-pune", "roles": ["Java Developer"], "cities": ["Pune"],
+       "keywords": ["java", "spring"], "experience": [3, 8], "export": "java_pune_{timestamp}.csv"}
+    ]
+
+A crawl runs the union of all profiles' searches, so a results page is
+fetched once however many profiles want it, and a ``ProfileSink`` hands
+each result to the export of every profile whose matcher accepts it.
+"""
+import json
+import os
+
+from dedup import CITY_ALIASES, normalize_location, normalize_text
+from exporters import open_sink
+from matcher import HIRING_KEYWORDS, TECH_KEYWORDS, RelevanceMatcher
+
+# Search profiles used instead of the built-in one when this file exists
+PROFILE_FILE = 'profiles.json'
+
+# Words of a role that say nothing about the kind of work
+GENERIC_ROLE_WORDS = {
+    'developer', 'engineer', 'programmer', 'senior', 'junior', 'sr', 'jr', 'lead',
+    'associate', 'intern', 'specialist', 'i', 'ii', 'iii',
+}
+
+# LinkedIn's own spelling of a city, where it is not "<City>, India"
+LINKEDIN_REGIONS = {'bangalore': 'Bangalore, Karnataka, India'}
+
+
+class Profile:
+    """One set of search criteria.
+
+    ``keywords`` defaults to the roles without words like "Developer"
+    ("React Developer" -> "react"); ``linkedin_searches`` to "#hiring
+    <role> <city>".  ``{timestamp}`` in ``export`` is filled in per run.
+    """
+
+    def __init__(self, name, roles, cities=('Bangalore',), keywords=None, experience=(2, 5),
+                 export=None, linkedin_searches=None):
+        self.name = name
+        self.roles = list(roles)
+        self.cities = list(cities)
+        self.keywords = list(keywords) if keywords else role_keywords(self.roles)
+        self.experience = tuple(experience) if experience else None
+        self.export = export or f"{normalize_text(name).replace(' ', '_')}_jobs_{{timestamp}}.csv"
+        self.linkedin_searches = list(linkedin_searches) if linkedin_searches else [
+            f"#hiring {role.lower()} {city.lower()}" for city in self.cities for role in self.roles
+        ]
+        self.matcher = RelevanceMatcher(
+            {'tech': self.keywords, 'location': city_words(self.cities), 'hiring': HIRING_KEYWORDS},
+            self.experience,
+        )
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def load_profiles(path):
+    """Profiles defined in a JSON file (a list of Profile dicts)"""
+    with open(path, encoding='utf-8') as f:
+        return [Profile.from_dict(item) for item in json.load(f)]
+
+
+def role_keywords(roles):
+    keywords = []
+    for role in roles:
+        words = [word for word in normalize_text(role).split() if word not in GENERIC_ROLE_WORDS]
+        keyword = ' '.join(words) or normalize_text(role)
+        if keyword not in keywords:
+            keywords.append(keyword)
+    return keywords
+
+
+def city_words(cities):
+    """Lowercase spellings of some cities, aliases included"""
+    words = []
+    for city in cities:
+        canonical = normalize_location(city)
+        spellings = [city.lower(), canonical] + [
+            alias for alias, target in CITY_ALIASES.items() if target == canonical
+        ]
+        words.extend(word for word in spellings if word not in words)
+    return words
+
+
+def union_matcher(profiles):
+    """Matcher keeping what any profile might want.
+
+    It has every profile's keywords and cities and the span of their
+    experience ranges, so it can keep a few postings no single profile
+    accepts; ``ProfileSink`` drops those.
+    """
+    keywords, cities = [], []
+    for profile in profiles:
+        keywords.extend(word for word in profile.keywords if word not in keywords)
+        cities.extend(city for city in profile.cities if city not in cities)
+    ranges = [profile.experience for profile in profiles]
+    experience = None
+    if ranges and all(ranges):
+        highs = [high for _, high in ranges]
+        experience = (min(low for low, _ in ranges), None if None in highs else max(highs))
+    return RelevanceMatcher(
+        {'tech': keywords, 'location': city_words(cities), 'hiring': HIRING_KEYWORDS}, experience
+    )
+
+
+def searches(spec, profiles):
+    """Distinct ``(query, city)`` searches a source runs for a set of profiles"""
+    found = {}
+    for profile in profiles:
+        for city in profile.cities:
+            if not spec.supports(city):
+                continue
+            for role in profile.roles:
+                key = (normalize_text(role), normalize_location(city))
+                found.setdefault(key, (spec.search_query(role, city), city))
+    for query in spec.queries:
+        found.setdefault((normalize_text(query), normalize_location(spec.default_location)),
+                         (query, spec.default_location))
+    return list(found.values())
+
+
+def labelled_searches(spec, profiles):
+    """``(label, query, city)`` for each of ``searches``; the label names the
+    city when several are searched and the query does not already"""
+    found = searches(spec, profiles)
+    several_cities = len({normalize_location(city) for _, city in found}) > 1
+    return [
+        (f"{query} ({city})" if several_cities and city.lower() not in query.lower() else query, query, city)
+        for query, city in found
+    ]
+
+
+def linkedin_searches(profiles):
+    """Distinct LinkedIn post searches of a set of profiles"""
+    found = {}
+    for profile in profiles:
+        for query in profile.linkedin_searches:
+            found.setdefault(normalize_text(query), query)
+    return list(found.values())
+
+
+def linkedin_jobs_searches(profiles):
+    """Distinct ``(role, city, LinkedIn location)`` job searches of a set of profiles"""
+    found = {}
+    for profile in profiles:
+        for city in profile.cities:
+            region = LINKEDIN_REGIONS.get(normalize_location(city), f"{city}, India")
+            for role in profile.roles:
+                found.setdefault((normalize_text(role), normalize_location(city)), (role, city, region))
+    return list(found.values())
+
+
+class ProfileSink:
+    """Streams each record to the sink of every profile that accepts it.
+
+    A profile accepts a record whose title mentions one of its keywords,
+    whose stated experience (if any) overlaps its range and whose location
+    is one of its cities.  A location naming none of the profiles' cities
+    (say "Remote") counts as in every city.
+
+    Each profile is one keyword group of a shared ``RelevanceMatcher``, so
+    routing costs one scan of the title and one of the location however
+    many profiles there are.
+    """
+
+    def __init__(self, routes):
+        self.routes = list(routes)
+        self.sinks = [sink for _, sink in self.routes]
+        self.path = ', '.join(sink.path for sink in self.sinks)
+        self.count = 0
+        self._groups = [str(i) for i in range(len(self.routes))]
+        self._titles = RelevanceMatcher(
+            {group: profile.keywords for group, (profile, _) in zip(self._groups, self.routes)}, None
+        )
+        self._places = RelevanceMatcher(
+            {group: city_words(profile.cities) for group, (profile, _) in zip(self._groups, self.routes)}, None
+        )
+
+    def write(self, record):
+        title = self._titles.scan(f"{record['Job Title']} {record.get('Experience', '')}")
+        place = self._places.scan(record.get('Location') or '')
+        located = bool(place.mask & ~place.group_bits['experience'])
+        for group, (profile, sink) in zip(self._groups, self.routes):
+            if (title[group] and (not located or place[group])
+                    and profile.matcher.experience_ok(title.experience)):
+                sink.write(record)
+        self.count += 1
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def open_profile_sink(profiles, timestamp, fmt=None):
+    """A ProfileSink writing each profile's matches to its own export file.
+
+    ``fmt`` ('csv' or 'jsonl') overrides the format, and extension, of the
+    profiles' export files.
+    """
+    routes = []
+    for profile in profiles:
+        path = profile.export.format(timestamp=timestamp)
+        if fmt:
+            path = f"{os.path.splitext(path)[0]}.{fmt}"
+        routes.append((profile, open_sink(path, fmt)))
+    return ProfileSink(routes)
+
+
+DEFAULT_PROFILE = Profile(
+    'default',
+    roles=['React Developer', 'Frontend Developer', 'Full Stack Developer'],
+    cities=['Bangalore'],
+    keywords=TECH_KEYWORDS,
+    experience=(2, 5),
+    export='bangalore_jobs_{timestamp}.csv',
+    linkedin_searches=[
+        "#hiring react js bangalore",
+        "#hiring frontend bangalore",
+        "#hiring fullstack bangalore",
+        "#hiring reactjs bangalore",
+        "#hiring frontend developer bangalore",
+    ],
+)
@@ -0,0 +1,140 @@
+import random
+import time
+from datetime import datetime, timezone
+
+# Responses that mean "slow down / try again later"
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket whose refill rate can be changed while running"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_at(self, now):
+        """Monotonic time at which a token will be available"""
+        self._refill(now)
+        if self.tokens >= 1:
+            return now
+        return now + (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class AdaptiveRate:
+    """AIMD control of a host's request rate.
+
+    Healthy responses add ``increase`` requests/second up to ``max_rate``;
+    throttling responses (429/503) or a latency spike multiply the rate by
+    ``decrease`` down to ``min_rate``.
+    """
+
+    def __init__(self, bucket, min_rate, max_rate, increase=None, decrease=0.5, slow_factor=3.0):
+        self.bucket = bucket
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase if increase is not None else max_rate / 10
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.latency = None
+        self.samples = 0
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def _set_rate(self, rate):
+        self.bucket.rate = max(self.min_rate, min(self.max_rate, rate))
+
+    def on_response(self, status, latency):
+        throttled = status in THROTTLE_STATUSES
+        slow = (self.samples >= 3 and self.latency is not None
+                and latency > self.slow_factor * self.latency)
+        if throttled or slow:
+            self._set_rate(self.rate * self.decrease)
+        elif status < 500:
+            self._set_rate(self.rate + self.increase)
+        if not throttled:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.samples += 1
+
+    def on_failure(self):
+        self._set_rate(self.rate * self.decrease)
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After"""
+
+    def __init__(self, max_retries=3, base_delay=1.0, max_delay=60.0, statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = set(statuses)
+
+    def should_retry(self, attempt, status=None):
+        if attempt >= self.max_retries:
+            return False
+        return status is None or status in self.statuses
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retry number ``attempt + 1``"""
+        if retry_after is not None:
+            return min(self.max_delay, retry_after)
+        # "Full jitter": anywhere between 0 and the exponential ceiling
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    # HTTP dates are rare here; keep email out of every start-up
+    from email.utils import parsedate_to_datetime
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostPolicy:
+    """Concurrency and pacing rules for a single host.
+
+    ``min_interval`` is the starting gap between requests; the host's rate
+    then adapts between one request per ``max_interval`` seconds and
+    ``speedup`` times the starting rate.
+    """
+
+    def __init__(self, max_concurrency=2, min_interval=1.0, burst=1, speedup=4.0, max_interval=60.0):
+        self.max_concurrency = max_concurrency
+        self.min_interval = min_interval
+        self.burst = burst
+        self.speedup = speedup
+        self.max_interval = max_interval
+
+    def limiter(self):
+        """A fresh adaptive rate limiter for one host, or None for no pacing"""
+        if self.min_interval <= 0:
+            return None
+        rate = 1.0 / self.min_interval
+        return AdaptiveRate(
+            TokenBucket(rate, self.burst),
+            min_rate=min(rate, 1.0 / self.max_interval),
+            max_rate=rate * self.speedup,
+        )
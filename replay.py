@@ -0,0 +1,207 @@
+"""Record live responses into a fixture archive and replay them offline.
+
+``python replay.py record fixtures.zip`` runs the Naukri, Indeed, Glassdoor
+and company-page searches against the live sites and stores every response
+in a compressed zip archive.  ``python replay.py replay fixtures.zip``
+serves that archive from a local stub server and runs the same searches
+against it, so results and timings can be compared run to run (the
+``replay`` is optional: ``python replay.py fixtures.zip`` does the same).
+"""
+import hashlib
+import json
+import sys
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from requests.utils import requote_uri
+
+from fetch_engine import FetchEngine, HostPolicy
+
+# Response headers worth replaying; the stub sets length and encoding itself
+REPLAY_HEADERS = ('content-type', 'etag', 'last-modified', 'retry-after', 'location')
+
+# Replayed runs go as fast as the stub answers
+REPLAY_POLICY = HostPolicy(max_concurrency=4, min_interval=0)
+
+
+def fixture_key(host, path_and_query):
+    """Archive key of a request: host plus path and query, scheme ignored"""
+    return hashlib.sha1(f'{host.lower()}{path_and_query}'.encode('utf-8')).hexdigest()
+
+
+def url_fixture_key(url):
+    # Key on the URL as requests will send it, which may re-quote the path
+    parts = urlsplit(requote_uri(url))
+    return fixture_key(parts.netloc, (parts.path or '/') + (f'?{parts.query}' if parts.query else ''))
+
+
+class FixtureArchive:
+    """Zip archive (deflate) of HTTP responses: ``<key>.json`` metadata plus ``<key>.body``"""
+
+    def __init__(self, path, mode='r'):
+        self.path = path
+        self.mode = mode
+        self._zip = zipfile.ZipFile(path, mode, compression=zipfile.ZIP_DEFLATED)
+        self._names = set(self._zip.namelist())
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def add(self, url, status, headers, body, encoding=None):
+        key = url_fixture_key(url)
+        meta = {
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() in REPLAY_HEADERS},
+            'encoding': encoding,
+        }
+        with self._lock:
+            if key + '.json' in self._names:
+                return
+            self._zip.writestr(key + '.json', json.dumps(meta))
+            self._zip.writestr(key + '.body', body)
+            self._names.update((key + '.json', key + '.body'))
+            self.recorded += 1
+
+    def record(self, url, response):
+        """FetchEngine recorder hook: store a response as served to callbacks"""
+        self.add(url, response.status_code, response.headers, response.content, response.encoding)
+
+    def lookup(self, key):
+        """(meta, body) stored under a key, or None"""
+        with self._lock:
+            if key + '.json' not in self._names:
+                return None
+            meta = json.loads(self._zip.read(key + '.json'))
+            return meta, self._zip.read(key + '.body')
+
+    def __len__(self):
+        return sum(1 for name in self._names if name.endswith('.json'))
+
+    def close(self):
+        self._zip.close()
+
+
+class FixtureServer:
+    """Local HTTP server answering requests from a FixtureArchive.
+
+    Requests are matched on the ``Host`` header plus path and query, which
+    is what ``FetchEngine(base_url=server.url)`` sends.  Unknown requests
+    get a 404 and are counted in ``misses``.
+    """
+
+    def __init__(self, archive, host='127.0.0.1', port=0):
+        self.archive = archive
+        self.served = 0
+        self.misses = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                found = server.archive.lookup(fixture_key(self.headers.get('Host', ''), self.path))
+                if found is None:
+                    server.misses.append(f"{self.headers.get('Host')}{self.path}")
+                    status, headers, body = 404, {}, b''
+                else:
+                    meta, body = found
+                    server.served += 1
+                    status, headers = meta['status'], meta['headers']
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def replay_engine(server, metrics=None):
+    """A FetchEngine that sends every request to a FixtureServer without pacing"""
+    return FetchEngine(default_policy=REPLAY_POLICY, base_url=server.url, metrics=metrics)
+
+
+def run_searches(searcher):
+    """The searches covered by fixtures"""
+    searcher.search_naukri_jobs()
+    searcher.search_indeed_jobs()
+    searcher.search_glassdoor_jobs()
+    searcher.search_company_pages()
+
+
+def record(path):
+    """Run the searches against the live sites, saving every response"""
+    from job_search import JobSearcher
+
+    archive = FixtureArchive(path, 'w')
+    searcher = JobSearcher(cache_dir=None, crawl_state=None)
+    searcher.engine.recorder = archive
+    try:
+        run_searches(searcher)
+    finally:
+        searcher.engine.sessions.close()
+        archive.close()
+    print(f"📼 Recorded {archive.recorded} responses to {path} ({len(searcher.results)} results)")
+
+
+def replay(path):
+    """Run the searches against a local server replaying an archive"""
+    from job_search import JobSearcher
+
+    archive = FixtureArchive(path)
+    with FixtureServer(archive) as server:
+        searcher = JobSearcher(engine=replay_engine(server), cache_dir=None, crawl_state=None)
+        start = time.perf_counter()
+        run_searches(searcher)
+        elapsed = time.perf_counter() - start
+        searcher.engine.sessions.close()
+    archive.close()
+    print(f"▶️  Replayed {server.served} responses in {elapsed:.2f}s: {len(searcher.results)} results"
+          + (f", {len(server.misses)} requests not in the archive" if server.misses else ""))
+    return searcher
+
+
+def main(argv):
+    if len(argv) == 1:
+        argv = ['replay'] + argv
+    if len(argv) != 2 or argv[0] not in ('record', 'replay'):
+        print("Usage: python replay.py [record|replay] <fixtures.zip>")
+        return 2
+    if argv[0] == 'record':
+        record(argv[1])
+    else:
+        replay(argv[1])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
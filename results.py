@@ -0,0 +1,202 @@
+"""Column-backed container for job results.
+
+A ``ResultTable`` keeps one list per field instead of one dict per job, and
+interns the low-cardinality columns (company, location, date, source), so a
+million postings share one copy of each repeated string.  Filtering,
+sorting and grouping work on whole columns.  Rows are handed out as
+``JobRow`` views that read and write through to the table and behave like
+the dict records used elsewhere (sinks, the job store, enrichment).
+"""
+import sys
+from collections.abc import Mapping
+from operator import itemgetter
+
+from exporters import FIELDNAMES
+
+# Columns whose values repeat across many postings
+INTERNED_FIELDS = ('Company Name', 'Location', 'Posting Date', 'Source', 'Experience', 'Salary')
+
+
+class JobRow(Mapping):
+    """View of one table row as a read/write mapping of field name to value.
+
+    Fields that were never set (stored as None) are absent, as they would be
+    from a dict record.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, name):
+        value = self.table.columns[name][self.index]
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __iter__(self):
+        index = self.index
+        return (name for name, column in self.table.columns.items() if column[index] is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __setitem__(self, name, value):
+        self.table.set(self.index, name, value)
+
+    def update(self, fields):
+        for name, value in fields.items():
+            self.table.set(self.index, name, value)
+
+    def __repr__(self):
+        return f'JobRow({dict(self)!r})'
+
+
+class ResultTable:
+    """Job results stored column by column.
+
+    Besides its position, each row has an id that stays unique after
+    ``clear()``, for indexes that refer to rows (see ``row``).
+    """
+
+    def __init__(self, fields=FIELDNAMES, interned=INTERNED_FIELDS):
+        self.columns = {name: [] for name in fields}
+        self.interned = set(interned)
+        # Rows dropped by clear(); row ids continue after them
+        self.base = 0
+
+    def __len__(self):
+        return len(self.columns[next(iter(self.columns))])
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return (JobRow(self, index) for index in range(len(self)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [JobRow(self, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return JobRow(self, index)
+
+    def _value(self, name, value):
+        if name in self.interned and type(value) is str:
+            return sys.intern(value)
+        return value
+
+    def append(self, record):
+        """Add a record (any mapping of field name to value); returns its row"""
+        index = len(self)
+        get = record.get
+        for name, column in self.columns.items():
+            value = get(name)
+            if type(value) is str and name in self.interned:
+                value = sys.intern(value)
+            column.append(value)
+        return JobRow(self, index)
+
+    def row_id(self, index):
+        return self.base + index
+
+    def next_row_id(self):
+        """Id the next appended row will get"""
+        return self.base + len(self)
+
+    def row(self, row_id):
+        """Row with a given id, or None once it has been cleared"""
+        index = row_id - self.base
+        return JobRow(self, index) if 0 <= index < len(self) else None
+
+    def set(self, index, name, value):
+        self.columns[name][index] = self._value(name, value)
+
+    def column(self, name):
+        return self.columns[name]
+
+    def mask(self, name, predicate):
+        """Row numbers whose ``name`` value satisfies ``predicate``"""
+        return [index for index, value in enumerate(self.columns[name]) if predicate(value)]
+
+    def keep(self, indices):
+        """Keep only the given rows, in the given order.
+
+        Rows are renumbered and get new ids; views taken before no longer
+        refer to the same jobs.
+        """
+        indices = list(indices)
+        if len(indices) == len(self) and indices == list(range(len(self))):
+            return
+        self.base += len(self)
+        for column in self.columns.values():
+            column[:] = _gather(column, indices)
+
+    def filter(self, name, predicate):
+        """Drop the rows whose ``name`` value fails ``predicate``"""
+        self.keep(self.mask(name, predicate))
+
+    def clear(self):
+        """Drop every row; ids of later rows do not reuse theirs"""
+        self.base += len(self)
+        for column in self.columns.values():
+            column.clear()
+
+    def argsort(self, name, reverse=False):
+        """Row numbers ordered by one column (stable, like ``sorted``)"""
+        return sorted(range(len(self)), key=self.columns[name].__getitem__, reverse=reverse)
+
+    def sorted_rows(self, name, reverse=False):
+        return (JobRow(self, index) for index in self.argsort(name, reverse))
+
+    def group(self, name):
+        """Row numbers grouped by the value of one column"""
+        groups = {}
+        for index, value in enumerate(self.columns[name]):
+            groups.setdefault(value, []).append(index)
+        return groups
+
+    def counts(self, name):
+        """Number of rows per value of one column"""
+        return {value: len(indices) for value, indices in self.group(name).items()}
+
+    def to_arrow(self, order=None):
+        """The table as a ``pyarrow.Table`` of string columns, rows in ``order`` if given"""
+        pyarrow = _pyarrow()
+        table = pyarrow.table({name: pyarrow.array(column, type=pyarrow.string())
+                               for name, column in self.columns.items()})
+        return table if order is None else table.take(order)
+
+    def write_parquet(self, path, order=None):
+        table = self.to_arrow(order)
+        _pyarrow().parquet.write_table(table, path, compression='zstd')
+        return path
+
+    def write_feather(self, path, order=None):
+        """Arrow IPC (Feather v2) file"""
+        table = self.to_arrow(order)
+        _pyarrow().feather.write_feather(table, path, compression='zstd')
+        return path
+
+
+def _pyarrow():
+    # Imported on first export: loading pyarrow takes longer than a whole quick run
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:  # Arrow/Parquet export is optional
+        raise ImportError("Arrow/Parquet export needs pyarrow: pip install pyarrow") from None
+    return pyarrow
+
+
+def _gather(column, indices):
+    if not indices:
+        return []
+    if len(indices) == 1:
+        return [column[indices[0]]]
+    return list(itemgetter(*indices)(column))
@@ -0,0 +1,270 @@
+"""Declarative job-site definitions.
+
+Each results-page site is a ``SourceSpec``: URL template, card selector,
+field selectors and rate policy.  ``JobSearcher`` runs every registered
+spec through the same fetch -> parse -> filter -> store path, so adding a
+site means adding data here (or in a JSON file loaded with
+``load_source_file``) rather than another ``search_*`` method.  What to
+search for (roles and cities) comes from the profiles (see profiles.py).
+"""
+import json
+from urllib.parse import quote_plus, urlsplit
+
+from dedup import normalize_location
+from rate_limit import HostPolicy
+
+
+class SourceSpec:
+    """One job site: where to fetch, what to extract and how fast to go.
+
+    ``url_template`` may use ``{query}`` (URL-encoded), ``{slug}``
+    (lowercase, hyphenated), ``{city}``, ``{city_slug}``, ``{page_part}``
+    and any extra variables returned by ``url_vars(query, city)`` or
+    listed for the city in ``locations``.  ``page_part`` is empty on page 1
+    and ``page_format`` (with ``{page}`` and ``{offset}``) on later pages.
+
+    ``query_format`` turns a profile's role and city into the site's search
+    text.  A site with ``locations`` (city -> URL variables, for sites that
+    need a location id) is only searched in the cities listed there.
+    ``queries`` are extra search texts this site always runs, in
+    ``default_location``.
+
+    ``fields`` maps a record field to one or more CSS selectors tried in
+    order; ``"css@attr"`` reads an attribute instead of the element text.
+    """
+
+    REQUIRED_FIELDS = ('title', 'company', 'url')
+
+    def __init__(self, key, name, url_template, card, fields, queries=(),
+                 page_format='', page_size=10, base_url='', default_location='Bangalore',
+                 filter_relevant=True, rate=None, max_pages=None, url_vars=None,
+                 query_format='{role}', locations=None):
+        self.key = key
+        self.name = name
+        self.url_template = url_template
+        self.card = card
+        self.extractor = CardExtractor(card, fields)
+        self.queries = list(queries)
+        self.page_format = page_format
+        self.page_size = page_size
+        self.base_url = base_url
+        self.default_location = default_location
+        self.filter_relevant = filter_relevant
+        self.rate = rate or HostPolicy()
+        self.max_pages = max_pages
+        self.url_vars = url_vars
+        self.query_format = query_format
+        self.locations = (
+            {normalize_location(city): variables for city, variables in locations.items()}
+            if locations is not None else None
+        )
+        self.host = urlsplit(url_template).netloc.lower()
+
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        card = data.pop('card')
+        data['card'] = (card['tag'], card.get('attrs', {}))
+        rate = data.pop('rate', None)
+        if rate:
+            data['rate'] = HostPolicy(**rate)
+        return cls(**data)
+
+    def supports(self, city):
+        return self.locations is None or normalize_location(city) in self.locations
+
+    def search_query(self, role, city):
+        """Search text for a role in a city"""
+        return self.query_format.format(role=role, city=city)
+
+    def page_url(self, query, page=1, city=None):
+        city = city or self.default_location
+        page_part = ''
+        if page > 1 and self.page_format:
+            page_part = self.page_format.format(page=page, offset=(page - 1) * self.page_size)
+        slug = query.lower().replace(' ', '-')
+        city_slug = city.lower().replace(' ', '-')
+        variables = {
+            'query': quote_plus(query), 'slug': quote_plus(slug), 'page_part': page_part,
+            'city': quote_plus(city), 'city_slug': quote_plus(city_slug),
+        }
+        if self.locations:
+            variables.update(self.locations.get(normalize_location(city), {}))
+        if self.url_vars:
+            variables.update(self.url_vars(query, city))
+        return self.url_template.format(**variables)
+
+    @property
+    def fields(self):
+        return self.extractor.fields
+
+    def extract(self, card):
+        """Field values of one card; None for fields that are missing"""
+        return self.extractor.extract(card)
+
+    def extract_page(self, content):
+        return self.extractor.extract_page(content)
+
+
+class CardExtractor:
+    """The card and field selectors of a source, separate from the rest of it.
+
+    It pickles as its selector strings, so a parse worker process (see
+    parse_pool.py) gets it without the source's URL and rate settings.
+    Selectors are compiled on first use, so listing or planning searches
+    never loads the HTML parser.
+    """
+
+    def __init__(self, card, fields):
+        self.card = card
+        self.selectors = {field: _as_list(selectors) for field, selectors in fields.items()}
+        self._fields = None
+
+    @property
+    def fields(self):
+        if self._fields is None:
+            self._fields = {
+                field: [_compile_selector(selector) for selector in selectors]
+                for field, selectors in self.selectors.items()
+            }
+        return self._fields
+
+    def __getstate__(self):
+        return self.card, self.selectors
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def extract(self, card):
+        values = {}
+        for field, selectors in self.fields.items():
+            values[field] = None
+            for selector, attr in selectors:
+                elem = selector.select_one(card) if selector else card
+                if elem is None:
+                    continue
+                value = elem.get(attr, '') if attr else elem.get_text(strip=True)
+                if value:
+                    values[field] = value
+                    break
+        return values
+
+    def extract_page(self, content):
+        """``(cards, records, errors)`` for a results page: the number of job
+        cards, the field values of each card and the exceptions raised by
+        cards that could not be read"""
+        from parsing import find_cards
+
+        records, errors = [], []
+        cards = find_cards(content, *self.card)
+        for card in cards:
+            try:
+                records.append(self.extract(card))
+            except Exception as e:
+                errors.append(e)
+        return len(cards), records, errors
+
+
+def _as_list(value):
+    return value if isinstance(value, (list, tuple)) else [value]
+
+
+def _compile_selector(selector):
+    import soupsieve
+
+    css, _, attr = selector.partition('@')
+    return (soupsieve.compile(css) if css else None), (attr or None)
+
+
+SOURCES = {}
+
+
+def register_source(spec):
+    SOURCES[spec.key] = spec
+    return spec
+
+
+def load_source_file(path):
+    """Register every source defined in a JSON file (a list of SourceSpec dicts)"""
+    with open(path, encoding='utf-8') as f:
+        return [register_source(SourceSpec.from_dict(item)) for item in json.load(f)]
+
+
+def host_policies():
+    """Per-host rate policies of every registered source"""
+    return {spec.host: spec.rate for spec in SOURCES.values()}
+
+
+register_source(SourceSpec(
+    key='indeed',
+    name='Indeed.com',
+    url_template='https://in.indeed.com/jobs?q={query}&l={city}{page_part}',
+    page_format='&start={offset}',
+    page_size=10,
+    card=('div', {'class': 'job_seen_beacon'}),
+    fields={
+        'title': ['h2.jobTitle a@title', 'h2.jobTitle a'],
+        'url': 'h2.jobTitle a@href',
+        'company': 'span.companyName',
+        'location': 'div.companyLocation',
+        'age': 'span.date',
+    },
+    base_url='https://in.indeed.com',
+    rate=HostPolicy(max_concurrency=2, min_interval=2.0),
+))
+
+register_source(SourceSpec(
+    key='naukri',
+    name='Naukri.com',
+    # Later pages are /jobs-in-bangalore-2, -3, ...
+    url_template='https://www.naukri.com/jobs-in-{city_slug}{page_part}?k={query}',
+    page_format='-{page}',
+    card=('article', {'class': 'jobTuple'}),
+    fields={
+        'title': 'a.title',
+        'url': 'a.title@href',
+        'company': 'a.subTitle',
+        'location': 'span.ellipsis.location',
+        'age': 'span.job-post-day',
+        'experience': '.experience, .expwdth',
+    },
+    base_url='https://www.naukri.com',
+    query_format='{role} {city}',
+    rate=HostPolicy(max_concurrency=2, min_interval=2.0),
+))
+
+register_source(SourceSpec(
+    key='glassdoor',
+    name='Glassdoor',
+    # IL.0,<n> and KO<start>,<end> mark where the city and keyword sit in the path;
+    # later pages end in _IP2.htm, ...
+    url_template=('https://www.glassdoor.co.in/Job/{city_slug}-{slug}-jobs-SRCH_IL.0,{city_end}_{location_id}'
+                  '_KO{keyword_start},{keyword_end}{page_part}.htm'),
+    url_vars=lambda query, city: {
+        'city_end': len(city.replace(' ', '-')),
+        'keyword_start': len(city.replace(' ', '-')) + 1,
+        'keyword_end': len(city.replace(' ', '-')) + 1 + len(query.replace(' ', '-')),
+    },
+    locations={'Bangalore': {'location_id': 'IC2940587'}},
+    page_format='_IP{page}',
+    card=('li', {'class': 'react-job-listing'}),
+    fields={
+        'title': 'a[data-test="job-title"]',
+        'url': 'a[data-test="job-title"]@href',
+        'company': 'span[data-test="employer-name"]',
+        'age': 'div[data-test="job-age"]',
+    },
+    base_url='https://www.glassdoor.co.in',
+    filter_relevant=False,
+    rate=HostPolicy(max_concurrency=1, min_interval=3.0),  # Longer delay for Glassdoor
+))
+
+# Career sites crawled by company_crawler.CompanyCrawler.  Optional keys:
+# 'greenhouse' (board token), 'lever' (company slug) and 'sitemap' (URL,
+# defaults to /sitemap.xml on the careers host).
+COMPANY_PAGES = [
+    {"name": "Flipkart", "url": "https://www.flipkartcareers.com/"},
+    {"name": "Swiggy", "url": "https://careers.swiggy.com/"},
+    {"name": "Razorpay", "url": "https://razorpay.com/careers/"},
+    {"name": "BYJU'S", "url": "https://byjus.com/careers/"},
+]
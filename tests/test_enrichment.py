@@ -0,0 +1,25 @@
+from datetime import date, timedelta
+
+from enrichment import parse_detail
+
+TODAY = date(2026, 10, 18)
+
+
+def posted(text):
+    return parse_detail(f'<html><body><p>{text}</p></body></html>'.encode(), TODAY)['posted']
+
+
+def test_posted_age_and_date():
+    assert posted('Posted: 3 days ago | 120 applicants') == TODAY - timedelta(days=3)
+    assert posted('Posted on 2026-10-10') == date(2026, 10, 10)
+    assert posted('Job posted today') == TODAY
+    assert posted('Posted 30+ days ago') == TODAY - timedelta(days=30)
+
+
+def test_age_followed_by_ago():
+    assert posted('Apply within 30 days. Updated 2 days ago') == TODAY - timedelta(days=2)
+
+
+def test_unrelated_day_counts_are_not_posting_ages():
+    assert posted('Posted by HR, notice of 30 days') is None
+    assert posted('Probation of 90 days, 15 days of leave') is None
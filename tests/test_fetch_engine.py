@@ -0,0 +1,187 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fetch_engine import FetchEngine, FetchTask, HostPolicy, PagedCrawl, Pending
+from instrumentation import RunMetrics
+from rate_limit import RetryPolicy
+
+# No pacing, so only the limit under test holds requests back
+UNPACED = HostPolicy(max_concurrency=4, min_interval=0)
+
+
+class StubServer:
+    """Local HTTP server whose answers the tests script per path.
+
+    ``routes`` maps a path to a function of the hit number (1 for the first
+    request) returning ``(status, headers, body)``; every request is
+    logged as ``(host, path)`` and the most requests in progress at once
+    are kept per ``Host`` header.
+    """
+
+    def __init__(self, routes=None, delay=0.0):
+        self.routes = routes or {}
+        self.delay = delay
+        self.log = []
+        self.hits = {}
+        self.active = {}
+        self.most_active = {}
+        self.on_request = None
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                host = self.headers.get('Host', '')
+                with server._lock:
+                    server.log.append((host, self.path))
+                    hit = server.hits[self.path] = server.hits.get(self.path, 0) + 1
+                    active = server.active[host] = server.active.get(host, 0) + 1
+                    server.most_active[host] = max(server.most_active.get(host, 0), active)
+                if server.on_request:
+                    server.on_request(self.path)
+                time.sleep(server.delay)
+                route = server.routes.get(self.path)
+                status, headers, body = route(hit) if route else (200, {}, b'ok')
+                with server._lock:
+                    server.active[host] -= 1
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def paths(self):
+        return [path for _, path in self.log]
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def engine_for(server, host_policies=None, **kwargs):
+    """A FetchEngine sending every request to the stub, keeping the original hosts"""
+    kwargs.setdefault('default_policy', UNPACED)
+    return FetchEngine(host_policies, base_url=server.url, **kwargs)
+
+
+def test_per_host_concurrency_limit(server):
+    server.delay = 0.2
+    engine = engine_for(server, {
+        'a.test': HostPolicy(max_concurrency=2, min_interval=0),
+        'b.test': HostPolicy(max_concurrency=1, min_interval=0),
+    })
+    responses = []
+    tasks = [FetchTask(f'http://{host}/job/{i}', responses.append) for host in ('a.test', 'b.test') for i in range(6)]
+
+    assert engine.run(tasks) == 12
+    engine.sessions.close()
+    assert len(responses) == 12
+    assert server.most_active == {'a.test': 2, 'b.test': 1}
+
+
+def test_429_is_retried_after_retry_after(server):
+    server.routes['/busy'] = lambda hit: (429, {'Retry-After': '0'}, b'') if hit <= 2 else (200, {}, b'done')
+    metrics = RunMetrics()
+    # Without Retry-After the backoff could wait up to a minute
+    engine = engine_for(server, metrics=metrics, retry=RetryPolicy(base_delay=60))
+    bodies = []
+    start = time.monotonic()
+
+    engine.run([FetchTask('http://a.test/busy', lambda r: bodies.append(r.content), source='stub', query='busy')])
+    engine.sessions.close()
+
+    assert time.monotonic() - start < 10
+    assert bodies == [b'done']
+    assert server.hits['/busy'] == 3
+    assert metrics.stats[('stub', 'busy')].retries == 2
+    assert 'jobskrapp_retries_total{source="stub",query="busy"} 2' in metrics.prometheus()
+
+
+def test_429_gives_up_after_max_retries(server):
+    server.routes['/busy'] = lambda hit: (429, {'Retry-After': '0'}, b'')
+    engine = engine_for(server, retry=RetryPolicy(max_retries=1))
+    errors = []
+
+    engine.run([FetchTask('http://a.test/busy', lambda r: pytest.fail('no response expected'), errors.append)])
+    engine.sessions.close()
+
+    assert server.hits['/busy'] == 2
+    assert len(errors) == 1 and errors[0].response.status_code == 429
+
+
+def test_paged_crawl_stops_at_first_page_without_fresh_listings(server):
+    fresh = {1: 5, 2: 3, 3: 0, 4: 2, 5: 2}
+    for page, count in fresh.items():
+        server.routes[f'/jobs?page={page}'] = lambda hit, count=count: (200, {}, str(count).encode())
+    engine = engine_for(server)
+    crawl = PagedCrawl(lambda page: f'http://a.test/jobs?page={page}', lambda r: int(r.content),
+                       max_pages=5, window=1)
+
+    engine.run(crawl.tasks())
+    engine.sessions.close()
+
+    assert crawl.done
+    assert server.paths() == ['/jobs?page=1', '/jobs?page=2', '/jobs?page=3']
+
+
+def test_paged_crawl_follows_pending_counts(server):
+    engine = engine_for(server)
+    with ThreadPoolExecutor(1) as stage:
+        crawl = PagedCrawl(lambda page: f'http://a.test/jobs?page={page}',
+                           lambda r: Pending(stage.submit(lambda: 1)), max_pages=4, window=2)
+        engine.run(crawl.tasks())
+    engine.sessions.close()
+
+    assert not crawl.done
+    assert sorted(server.paths()) == [f'/jobs?page={page}' for page in range(1, 5)]
+
+
+def test_max_pending_holds_back_new_requests(server):
+    max_pending = 2
+    outstanding = []
+    lock = threading.Lock()
+
+    def finish(_):
+        with lock:
+            outstanding.pop()
+
+    def on_response(response):
+        with lock:
+            outstanding.append(response)
+        return Pending(stage.submit(time.sleep, 0.05), finish)
+
+    seen = []
+    server.on_request = lambda path: seen.append(len(outstanding))
+    # One worker, so nothing is in flight while a request is held back
+    engine = engine_for(server, max_workers=1, max_pending=max_pending)
+    with ThreadPoolExecutor(1) as stage:
+        engine.run([FetchTask(f'http://a.test/job/{i}', on_response) for i in range(8)])
+    engine.sessions.close()
+
+    assert len(seen) == 8
+    assert engine.stalls > 0
+    assert max(seen) < max_pending
+    assert not outstanding
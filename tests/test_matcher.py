@@ -0,0 +1,39 @@
+import random
+
+from matcher import RelevanceMatcher
+
+
+def substring_mask(matcher, text):
+    """What scanning should find: every keyword that occurs in the text"""
+    mask = 0
+    for word, bits in matcher.word_masks.items():
+        if word in text:
+            mask |= bits
+    return mask
+
+
+def test_keyword_inside_a_longer_one():
+    matcher = RelevanceMatcher({'react': ['react'], 'native': ['react native'], 'js': ['js']})
+    assert matcher.scan('React Native Developer').groups == {'react', 'native'}
+    assert matcher.scan('ReactJS Engineer').groups == {'react', 'js'}
+
+
+def test_keyword_straddling_the_end_of_another():
+    matcher = RelevanceMatcher({'first': ['ab'], 'second': ['bc']})
+    assert matcher.scan('abc').groups == {'first', 'second'}
+    assert matcher.matches('xabcx', ['first', 'second'])
+
+
+def test_is_relevant_sees_tech_keyword_inside_another_group_keyword():
+    matcher = RelevanceMatcher({'tech': ['java'], 'other': ['javascript developer']})
+    assert matcher.is_relevant('Javascript Developer')
+
+
+def test_scan_agrees_with_substring_search():
+    rng = random.Random(7)
+    for _ in range(200):
+        words = {''.join(rng.choice('abc') for _ in range(rng.randint(1, 4))) for _ in range(5)}
+        matcher = RelevanceMatcher({f'g{i}': [word] for i, word in enumerate(words)})
+        for _ in range(50):
+            text = ''.join(rng.choice('abcx') for _ in range(rng.randint(0, 12)))
+            assert matcher._scan_mask(text) == substring_mask(matcher, text), (words, text)
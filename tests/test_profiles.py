@@ -0,0 +1,52 @@
+from profiles import Profile, ProfileSink
+
+
+class ListSink:
+    def __init__(self, path):
+        self.path = path
+        self.records = []
+
+    def write(self, record):
+        self.records.append(record)
+
+    def close(self):
+        pass
+
+
+def route(profiles, record):
+    """Names of the profiles a ProfileSink hands ``record`` to"""
+    sink = ProfileSink([(profile, ListSink(profile.name)) for profile in profiles])
+    sink.write(record)
+    return {profile.name for profile, target in sink.routes if target.records}
+
+
+def record(title, location='Bangalore', **fields):
+    return {'Job Title': title, 'Location': location, **fields}
+
+
+def test_overlapping_profiles_both_receive_the_posting():
+    full_stack = Profile('full-stack', ['Full Stack Developer'])
+    full_stack_java = Profile('full-stack-java', ['Full Stack Java Developer'])
+    react = Profile('react', ['React Developer'])
+    react_native = Profile('react-native', ['React Native Developer'])
+    profiles = [full_stack, full_stack_java, react, react_native]
+
+    assert route(profiles, record('Full Stack Java Developer')) == {'full-stack', 'full-stack-java'}
+    assert route(profiles, record('React Native Developer')) == {'react', 'react-native'}
+    assert route(profiles, record('React Developer')) == {'react'}
+
+
+def test_card_experience_routes_by_range():
+    junior = Profile('junior', ['React Developer'], experience=(0, 2))
+    senior = Profile('senior', ['React Developer'], experience=(6, 10))
+
+    assert route([junior, senior], record('React Developer', Experience='7-9 Yrs')) == {'senior'}
+    assert route([junior, senior], record('React Developer')) == {'junior', 'senior'}
+
+
+def test_location_routes_to_its_city_or_everywhere():
+    blr = Profile('blr', ['React Developer'], cities=['Bangalore'])
+    pune = Profile('pune', ['React Developer'], cities=['Pune'])
+
+    assert route([blr, pune], record('React Developer', 'Pune, Maharashtra')) == {'pune'}
+    assert route([blr, pune], record('React Developer', 'Remote')) == {'blr', 'pune'}